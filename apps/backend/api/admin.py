@@ -34,6 +34,7 @@ class CollectionAdmin(admin.ModelAdmin):
     search_fields = ('name', 'description')
     readonly_fields = ('created_at', 'updated_at', 'total_cards')
     date_hierarchy = 'created_at'
+    list_select_related = ('created_by',)
     
     fieldsets = (
         (None, {'fields': ('name', 'description', 'status')}),
@@ -41,6 +42,13 @@ class CollectionAdmin(admin.ModelAdmin):
         ('Metadata', {'fields': ('created_by', 'created_at', 'updated_at'), 'classes': ('collapse',)}),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_card_count()
+
+    @admin.display(description='Total cards', ordering='card_count')
+    def total_cards(self, obj):
+        return obj.total_cards
+
 
 class OrderItemInline(admin.TabularInline):
 
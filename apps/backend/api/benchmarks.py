@@ -0,0 +1,206 @@
+import math
+import platform
+import tracemalloc
+from time import perf_counter
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cache import invalidate_sections
+from .models import User, Collection, Card, Order, OrderItem
+
+
+BENCHMARK_USERNAME = 'benchmark_staff'
+
+BENCHMARK_PERCENTILES = (50, 90, 95, 99)
+
+LATENCY_THRESHOLD = 0.2
+
+QUERY_THRESHOLD = 0
+
+MEMORY_THRESHOLD = 0.25
+
+LATENCY_FLOOR_MS = 1.0
+
+BENCHMARK_CACHE_SECTIONS = ('order_counters', 'collection_counters', 'user_counters', 'recent_orders', 'top_sellers')
+
+BENCHMARK_ENDPOINTS = (
+    ('users', 'user-list', None, {}),
+    ('users-me', 'user-me', None, {}),
+    ('collections', 'collection-list', None, {}),
+    ('collection-detail', 'collection-detail', Collection, {}),
+    ('collection-cards', 'collection-cards', Collection, {}),
+    ('cards', 'card-list', None, {}),
+    ('cards-filtered', 'card-list', None, {'rarity': 'foil', 'ordering': '-base_price'}),
+    ('cards-search', 'card-list', None, {'search': 'dragon'}),
+    ('cards-expanded', 'card-list', None, {'expand': 'collection'}),
+    ('card-detail', 'card-detail', Card, {}),
+    ('cards-low-stock', 'card-low-stock', None, {}),
+    ('cards-export', 'card-export', None, {'output': 'ndjson'}),
+    ('orders', 'order-list', None, {}),
+    ('orders-completed', 'order-list', None, {'status': 'completed'}),
+    ('order-detail', 'order-detail', Order, {}),
+    ('orders-export', 'order-export', None, {'output': 'csv'}),
+    ('dashboard-kpis', 'dashboard-kpis', None, {}),
+    ('dashboard-top-selling-cards', 'dashboard-top-selling-cards', None, {}),
+    ('dashboard-sales-series', 'dashboard-sales-series', None, {}),
+    ('dashboard-sales-series-weekly', 'dashboard-sales-series', None, {'granularity': 'week'}),
+    ('profile', 'user-profile', None, {}),
+)
+
+
+def percentile(values, rank):
+
+    ordered = sorted(values)
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+def latency_summary(timings):
+
+    milliseconds = [seconds * 1000 for seconds in timings]
+    summary = {f'p{rank}': round(percentile(milliseconds, rank), 3) for rank in BENCHMARK_PERCENTILES}
+    summary['mean'] = round(sum(milliseconds) / len(milliseconds), 3)
+    summary['max'] = round(max(milliseconds), 3)
+    return summary
+
+
+def dataset_counts():
+
+    return {
+        'users': User.objects.count(),
+        'collections': Collection.objects.count(),
+        'cards': Card.objects.count(),
+        'orders': Order.objects.count(),
+        'order_items': OrderItem.objects.count(),
+    }
+
+
+def endpoint_target(url_name, model):
+
+    if model is None:
+        return reverse(url_name), None
+    queryset = model.objects.order_by('pk')
+    total = queryset.count()
+    if not total:
+        return None, None
+    target = queryset[total // 2]
+    return reverse(url_name, kwargs={'pk': target.pk}), target
+
+
+def consume(response):
+
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class APIBenchmark:
+
+    def __init__(self, requests=20, warmup=2, cold_cache=False, endpoints=None, progress=None):
+        self.requests = max(requests, 1)
+        self.warmup = max(warmup, 0)
+        self.cold_cache = cold_cache
+        self.endpoints = [
+            endpoint for endpoint in BENCHMARK_ENDPOINTS
+            if not endpoints or endpoint[0] in endpoints
+        ]
+        self.progress = progress or (lambda message: None)
+
+    def run(self):
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'requests': self.requests,
+            'warmup': self.warmup,
+            'cold_cache': self.cold_cache,
+            'dataset': dataset_counts(),
+            'endpoints': {},
+        }
+        with transaction.atomic():
+            client = APIClient(SERVER_NAME='localhost')
+            staff = User.objects.create_user(
+                username=BENCHMARK_USERNAME,
+                email=f'{BENCHMARK_USERNAME}@example.com',
+                is_staff=True,
+            )
+            for name, url_name, model, params in self.endpoints:
+                url, target = endpoint_target(url_name, model)
+                if url is None:
+                    self.progress(f'  - {name}: skipped, no {model.__name__} rows')
+                    continue
+                client.force_authenticate(user=getattr(target, 'user', None) or staff)
+                result = self.measure(client, url, params)
+                report['endpoints'][name] = result
+                self.progress(
+                    f"  - {name}: p95 {result['latency_ms']['p95']:.1f} ms, "
+                    f"{result['queries']} queries, {result['peak_memory_kb']:.0f} KiB peak"
+                )
+            transaction.set_rollback(True)
+        invalidate_sections(*BENCHMARK_CACHE_SECTIONS)
+        return report
+
+    def request(self, client, url, params):
+
+        if self.cold_cache:
+            invalidate_sections(*BENCHMARK_CACHE_SECTIONS)
+        response = client.get(url, params)
+        return response, consume(response)
+
+    def measure(self, client, url, params):
+
+        invalidate_sections(*BENCHMARK_CACHE_SECTIONS)
+        for _ in range(self.warmup):
+            self.request(client, url, params)
+
+        timings = []
+        queries = 0
+        for _ in range(self.requests):
+            with CaptureQueriesContext(connection) as captured:
+                started = perf_counter()
+                response, size = self.request(client, url, params)
+                timings.append(perf_counter() - started)
+            queries = max(queries, len(captured))
+
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            self.request(client, url, params)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'url': url,
+            'params': params,
+            'status': response.status_code,
+            'response_bytes': size,
+            'latency_ms': latency_summary(timings),
+            'queries': queries,
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+
+def compare_reports(report, baseline, latency_threshold=LATENCY_THRESHOLD,
+                    query_threshold=QUERY_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+
+    regressions = []
+    for name, result in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            continue
+        current_p95, previous_p95 = result['latency_ms']['p95'], previous['latency_ms']['p95']
+        if (current_p95 - previous_p95 > LATENCY_FLOOR_MS
+                and current_p95 > previous_p95 * (1 + latency_threshold)):
+            regressions.append((name, 'latency_ms.p95', previous_p95, current_p95))
+        if result['queries'] - previous['queries'] > query_threshold:
+            regressions.append((name, 'queries', previous['queries'], result['queries']))
+        if result['peak_memory_kb'] > previous['peak_memory_kb'] * (1 + memory_threshold):
+            regressions.append((name, 'peak_memory_kb', previous['peak_memory_kb'], result['peak_memory_kb']))
+        if result['status'] != previous['status']:
+            regressions.append((name, 'status', previous['status'], result['status']))
+    return regressions
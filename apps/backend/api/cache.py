@@ -0,0 +1,104 @@
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+POLL_INTERVAL = 0.05
+
+SECTION_PREFIX = 'dashboard'
+
+
+def lock_key(key):
+    return f'{key}:lock'
+
+
+def acquire_lock(key, timeout=None):
+
+    token = uuid.uuid4().hex
+    timeout = timeout or settings.DASHBOARD_CACHE_LOCK_TIMEOUT
+    if cache.add(lock_key(key), token, timeout):
+        return token
+    return None
+
+
+def release_lock(key, token):
+
+    if cache.get(lock_key(key)) == token:
+        cache.delete(lock_key(key))
+
+
+def should_refresh(delta, expiry, beta=1.0, now=None):
+
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def get_or_compute(key, compute, timeout, beta=1.0):
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expiry = entry
+        if not should_refresh(delta, expiry, beta):
+            return value
+        token = acquire_lock(key)
+        if token is None:
+            return value
+        try:
+            return _recompute(key, compute, timeout)
+        finally:
+            release_lock(key, token)
+
+    token = acquire_lock(key)
+    if token is not None:
+        try:
+            return _recompute(key, compute, timeout)
+        finally:
+            release_lock(key, token)
+
+    deadline = time.time() + settings.DASHBOARD_CACHE_LOCK_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.get(lock_key(key)) is None:
+            break
+    return _recompute(key, compute, timeout)
+
+
+def _recompute(key, compute, timeout):
+    started = time.time()
+    value = compute()
+    finished = time.time()
+    cache.set(key, (value, finished - started, finished + timeout), timeout)
+    return value
+
+
+def version_key(section):
+    return f'{SECTION_PREFIX}:{section}:version'
+
+
+def section_keys(sections):
+
+    versions = cache.get_many([version_key(section) for section in sections])
+    keys = {}
+    for section in sections:
+        version = versions.get(version_key(section))
+        if version is None:
+            cache.add(version_key(section), time.time_ns(), None)
+            version = cache.get(version_key(section))
+        keys[section] = f'{SECTION_PREFIX}:{section}:v{version}'
+    return keys
+
+
+def invalidate_sections(*sections):
+
+    for section in set(sections):
+        try:
+            cache.incr(version_key(section))
+        except ValueError:
+            cache.add(version_key(section), time.time_ns(), None)
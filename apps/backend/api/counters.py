@@ -0,0 +1,126 @@
+from collections import Counter
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+
+from .cache import invalidate_sections
+from .dashboard import (
+    ACTIVE_COLLECTION_STATUSES, REVENUE_STATUS, dashboard_counters, order_status_key
+)
+from .models import Collection, DashboardCounter, Order
+
+
+DECIMAL_COUNTERS = ('total_revenue',)
+
+
+def order_counter_keys():
+
+    keys = ['total_orders', 'total_revenue']
+    keys += [order_status_key(status) for status, _ in Order.STATUS_CHOICES]
+    return keys
+
+
+def collection_counter_keys():
+
+    keys = ['total_collections', 'active_collections']
+    keys += [f'{status}_collections' for status, _ in Collection.STATUS_CHOICES]
+    keys += ['total_cards']
+    return keys
+
+
+def user_counter_keys():
+
+    return ['total_users']
+
+
+def counter_keys():
+
+    return order_counter_keys() + collection_counter_keys() + user_counter_keys()
+
+
+def order_deltas(status, order_value, sign=1):
+
+    deltas = Counter({'total_orders': sign, order_status_key(status): sign})
+    if status == REVENUE_STATUS:
+        deltas['total_revenue'] = sign * (order_value or Decimal('0'))
+    return deltas
+
+
+def collection_deltas(status, sign=1):
+
+    deltas = Counter({'total_collections': sign, f'{status}_collections': sign})
+    if status in ACTIVE_COLLECTION_STATUSES:
+        deltas['active_collections'] = sign
+    return deltas
+
+
+def card_deltas(sign=1):
+
+    return Counter({'total_cards': sign})
+
+
+def user_deltas(is_active, sign=1):
+
+    return Counter({'total_users': sign if is_active else 0})
+
+
+def apply_deltas(deltas):
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    updated = _increment(deltas)
+    if updated < len(deltas):
+        existing = set(DashboardCounter.objects.filter(key__in=deltas).values_list('key', flat=True))
+        missing = {key: delta for key, delta in deltas.items() if key not in existing}
+        DashboardCounter.objects.bulk_create(
+            [DashboardCounter(key=key) for key in missing],
+            ignore_conflicts=True,
+        )
+        _increment(missing)
+
+
+def _increment(deltas):
+    increment = Case(
+        *[When(key=key, then=Value(Decimal(delta))) for key, delta in deltas.items()],
+        default=Value(Decimal('0')),
+        output_field=DecimalField(max_digits=16, decimal_places=2),
+    )
+    return DashboardCounter.objects.filter(key__in=deltas).update(value=F('value') + increment)
+
+
+def read_counters(keys=None):
+
+    keys = keys or counter_keys()
+    values = dict(DashboardCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    if any(key not in values for key in keys):
+        return None
+    return {
+        key: values[key] if key in DECIMAL_COUNTERS else int(values[key])
+        for key in keys
+    }
+
+
+def rebuild_counters():
+
+    with transaction.atomic():
+        stored = dict(
+            DashboardCounter.objects.select_for_update().values_list('key', 'value')
+        )
+        actual = dashboard_counters()
+        drift = {
+            key: (stored.get(key), value)
+            for key, value in actual.items()
+            if stored.get(key) != value
+        }
+        DashboardCounter.objects.bulk_create(
+            [DashboardCounter(key=key, value=value) for key, value in actual.items()],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['value', 'updated_at'],
+        )
+    if drift:
+        invalidate_sections('order_counters', 'collection_counters', 'user_counters')
+    return drift
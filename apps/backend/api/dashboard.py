@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Q, Sum
+
+from .models import User, Collection, Card, Order
+
+
+REVENUE_STATUS = 'completed'
+
+ACTIVE_COLLECTION_STATUSES = ('pending', 'in_production')
+
+ORDER_STATUS_KEYS = {
+    'processing': 'pending_orders',
+}
+
+CENT = Decimal('0.01')
+
+
+def order_status_key(status):
+    return ORDER_STATUS_KEYS.get(status, f'{status}_orders')
+
+
+def order_counters():
+
+    aggregates = {
+        'total_orders': Count('id'),
+        'total_revenue': Sum(
+            'order_value',
+            filter=Q(status=REVENUE_STATUS),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    }
+    for status, _ in Order.STATUS_CHOICES:
+        aggregates[order_status_key(status)] = Count('id', filter=Q(status=status))
+
+    counters = Order.objects.order_by().aggregate(**aggregates)
+    counters['total_revenue'] = (counters['total_revenue'] or Decimal('0')).quantize(CENT)
+    return counters
+
+
+def collection_counters():
+
+    aggregates = {
+        'total_collections': Count('id'),
+        'active_collections': Count('id', filter=Q(status__in=ACTIVE_COLLECTION_STATUSES)),
+    }
+    for status, _ in Collection.STATUS_CHOICES:
+        aggregates[f'{status}_collections'] = Count('id', filter=Q(status=status))
+
+    counters = Collection.objects.order_by().aggregate(**aggregates)
+    counters.update(Card.objects.order_by().aggregate(total_cards=Count('id')))
+    return counters
+
+
+def user_counters():
+
+    return User.objects.order_by().aggregate(total_users=Count('id', filter=Q(is_active=True)))
+
+
+def dashboard_counters():
+
+    counters = {}
+    counters.update(order_counters())
+    counters.update(collection_counters())
+    counters.update(user_counters())
+    return counters
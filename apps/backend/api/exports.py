@@ -0,0 +1,183 @@
+import csv
+import io
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .utils import chunked
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_QUERY_PARAM = 'output'
+
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+NUMBER = re.compile(r'^[+-]?\d+(\.\d+)?$')
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+ORDER_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('order_number', 'order_number'),
+    ('user_email', 'user__email'),
+    ('status', 'status'),
+    ('order_value', 'order_value'),
+    ('order_date', 'order_date'),
+    ('completed_date', 'completed_date'),
+    ('notes', 'notes'),
+)
+
+ORDER_ITEM_EXPORT_FIELDS = (
+    ('id', 'items__id'),
+    ('card_id', 'items__card_id'),
+    ('card_name', 'items__card__name'),
+    ('quantity', 'items__quantity'),
+    ('unit_price', 'items__unit_price'),
+    ('total_price', 'items__total_price'),
+)
+
+CARD_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('collection_id', 'collection_id'),
+    ('collection_name', 'collection__name'),
+    ('category', 'category'),
+    ('rarity', 'rarity'),
+    ('base_price', 'base_price'),
+    ('market_price', 'market_price'),
+    ('stock_quantity', 'stock_quantity'),
+    ('is_active', 'is_active'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+
+def export_value(value):
+
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def export_rows(queryset, fields, chunk_size):
+
+    lookups = [lookup for _, lookup in fields]
+    for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        yield [export_value(value) for value in row]
+
+
+def csv_cell(value):
+
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES) and not NUMBER.match(value):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(header, rows, chunk_size):
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for chunk in chunked(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([csv_cell(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+
+
+def ndjson_lines(documents, chunk_size):
+
+    for chunk in chunked(documents, chunk_size):
+        yield ''.join(json.dumps(document) + '\n' for document in chunk)
+
+
+def order_documents(rows):
+
+    split = len(ORDER_EXPORT_FIELDS)
+    order_names = [name for name, _ in ORDER_EXPORT_FIELDS]
+    item_names = [name for name, _ in ORDER_ITEM_EXPORT_FIELDS]
+    for _, group in groupby(rows, key=itemgetter(0)):
+        document = None
+        items = []
+        for row in group:
+            if document is None:
+                document = dict(zip(order_names, row[:split]))
+            if row[split] is not None:
+                items.append(dict(zip(item_names, row[split:])))
+        document['items'] = items
+        yield document
+
+
+def export_orders(queryset, output, chunk_size=None):
+
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    fields = ORDER_EXPORT_FIELDS + ORDER_ITEM_EXPORT_FIELDS
+    rows = export_rows(queryset.order_by('id', 'items__id'), fields, chunk_size)
+    if output == 'ndjson':
+        return ndjson_lines(order_documents(rows), chunk_size)
+    header = [name for name, _ in ORDER_EXPORT_FIELDS] + [f'item_{name}' for name, _ in ORDER_ITEM_EXPORT_FIELDS]
+    return csv_lines(header, rows, chunk_size)
+
+
+def export_cards(queryset, output, chunk_size=None):
+
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    rows = export_rows(queryset.order_by('id'), CARD_EXPORT_FIELDS, chunk_size)
+    names = [name for name, _ in CARD_EXPORT_FIELDS]
+    if output == 'ndjson':
+        return ndjson_lines((dict(zip(names, row)) for row in rows), chunk_size)
+    return csv_lines(names, rows, chunk_size)
+
+
+def export_response(lines, output, filename):
+
+    response = StreamingHttpResponse(lines, content_type=EXPORT_CONTENT_TYPES[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
+
+
+class ExportViewMixin:
+
+    exporter = None
+    export_filename = None
+
+    @extend_schema(
+        description="Stream every row matching the list filters as CSV or NDJSON",
+        parameters=[
+            OpenApiParameter(EXPORT_QUERY_PARAM, str, enum=list(EXPORT_CONTENT_TYPES), description="Export format, csv by default"),
+        ],
+        responses={
+            (200, content_type): OpenApiTypes.STR for content_type in EXPORT_CONTENT_TYPES.values()
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+
+        output = request.query_params.get(EXPORT_QUERY_PARAM, 'csv')
+        if output not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {'error': f"Unsupported export output. Use one of: {', '.join(EXPORT_CONTENT_TYPES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(self.exporter(queryset, output), output, self.export_filename)
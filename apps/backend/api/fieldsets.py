@@ -0,0 +1,160 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_QUERY_PARAM = 'fields'
+
+EXPAND_QUERY_PARAM = 'expand'
+
+
+def parse_paths(value):
+
+    return [tuple(part for part in path.strip().split('.') if part) for path in value.split(',') if path.strip()]
+
+
+def selection_tree(paths):
+
+    tree = {}
+    for path in paths:
+        node = tree
+        for name in path:
+            node = node.setdefault(name, {})
+    return tree
+
+
+def sparse_params(context):
+
+    request = context.get('request')
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    return getattr(request, 'query_params', request.GET)
+
+
+class SparseFieldsetMixin:
+
+    def field_path(self):
+
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(names))
+
+    def selected_fields(self):
+
+        params = sparse_params(self.context)
+        if params is None or not params.get(FIELDS_QUERY_PARAM):
+            return None
+        node = selection_tree(parse_paths(params[FIELDS_QUERY_PARAM]))
+        for name in self.field_path():
+            if name not in node:
+                return None
+            node = node[name]
+        return set(node) or None
+
+    def expanded_fields(self):
+
+        params = sparse_params(self.context)
+        if params is None:
+            return set()
+        path = self.field_path()
+        paths = parse_paths(params.get(EXPAND_QUERY_PARAM, ''))
+        paths += parse_paths(params.get(FIELDS_QUERY_PARAM, ''))
+        return {p[len(path)] for p in paths if len(p) > len(path) and p[:len(path)] == path}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expanded = self.expanded_fields()
+        for name, (serializer_class, kwargs) in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name in expanded:
+                fields[name] = serializer_class(read_only=True, **kwargs)
+
+        selected = self.selected_fields()
+        if selected is not None:
+            for name in list(fields):
+                if name not in selected and not fields[name].write_only:
+                    fields.pop(name)
+        return fields
+
+    def get_model_fields(self, select_related=None):
+
+        opts = self.Meta.model._meta
+        source_fields = getattr(self.Meta, 'source_fields', {})
+        select_related = select_related if isinstance(select_related, dict) else {}
+        paths = [opts.pk.name]
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in source_fields:
+                paths.extend(source_fields[name])
+                continue
+            if isinstance(field, serializers.ListSerializer) or not field.source_attrs:
+                return None
+
+            relation_opts, related = opts, select_related
+            prefix = []
+            for attr in field.source_attrs[:-1]:
+                try:
+                    model_field = relation_opts.get_field(attr)
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.many_to_one or attr not in related:
+                    return None
+                prefix.append(attr)
+                paths.append('__'.join(prefix))
+                relation_opts, related = model_field.related_model._meta, related[attr]
+
+            attr = field.source_attrs[-1]
+            try:
+                model_field = relation_opts.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            if model_field.is_relation and not model_field.many_to_one:
+                return None
+            paths.append('__'.join(prefix + [attr]))
+
+            if model_field.many_to_one and attr in related and isinstance(field, SparseFieldsetMixin):
+                nested = field.get_model_fields(related[attr])
+                if nested is not None:
+                    paths.extend('__'.join(prefix + [attr, path]) for path in nested)
+        return list(dict.fromkeys(paths))
+
+
+class SparseFieldsetViewMixin:
+
+    def expanded_fields(self):
+
+        params = sparse_params({'request': self.request})
+        if params is None:
+            return set()
+        paths = parse_paths(params.get(EXPAND_QUERY_PARAM, ''))
+        paths += parse_paths(params.get(FIELDS_QUERY_PARAM, ''))
+        return {path[0] for path in paths}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = sparse_params({'request': self.request})
+        if params is None or not params.get(FIELDS_QUERY_PARAM):
+            return queryset
+
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+        paths = serializer.get_model_fields(queryset.query.select_related)
+        if paths is None:
+            return queryset
+        opts = queryset.model._meta
+        for field in getattr(self, 'keyset_ordering', None) or []:
+            paths.append(opts.get_field(field.lstrip('-')).name)
+        related = {
+            '__'.join(parts[:depth])
+            for parts in (path.split('__') for path in paths)
+            for depth in range(1, len(parts))
+        }
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*paths)
@@ -0,0 +1,99 @@
+import json
+from tempfile import SpooledTemporaryFile
+
+from django.db import DatabaseError
+
+from .orders import InsufficientStock, create_orders, fetch_cards, requested_card_ids
+from .serializers import OrderCreateSerializer
+from .utils import chunked
+
+
+IMPORT_CHUNK_SIZE = 500
+
+IMPORT_SPOOL_SIZE = 1024 * 1024
+
+
+def read_lines(stream):
+
+    if stream is None:
+        return
+    for line_number, line in enumerate(iter(stream.readline, b''), start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def line_error(line_number, errors):
+    return {'line': line_number, 'status': 'error', 'errors': errors}
+
+
+def import_orders(stream, user, context=None, chunk_size=None):
+
+    for chunk in chunked(read_lines(stream), chunk_size or IMPORT_CHUNK_SIZE):
+        try:
+            results = list(import_chunk(chunk, user, context or {}))
+        except DatabaseError:
+            results = [
+                line_error(line_number, {'non_field_errors': ['Import failed; this line was not saved.']})
+                for line_number, _ in chunk
+            ]
+        yield from results
+
+
+def spool_results(results):
+
+    spool = SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE)
+    for result in results:
+        spool.write(json.dumps(result).encode() + b'\n')
+    spool.seek(0)
+    return spool
+
+
+def import_chunk(chunk, user, context):
+
+    results = {}
+    payloads = []
+    for line_number, line in chunk:
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            results[line_number] = line_error(line_number, {'non_field_errors': ['Invalid JSON.']})
+            continue
+        if not isinstance(payload, dict):
+            results[line_number] = line_error(line_number, {'non_field_errors': ['Expected a JSON object.']})
+            continue
+        payloads.append((line_number, payload))
+
+    card_ids = set()
+    for _, payload in payloads:
+        card_ids |= requested_card_ids(payload.get('items'))
+    cards = fetch_cards(card_ids)
+
+    valid = []
+    for line_number, payload in payloads:
+        serializer = OrderCreateSerializer(data=payload, context={**context, 'cards': cards})
+        if serializer.is_valid():
+            valid.append((line_number, serializer.validated_data))
+        else:
+            results[line_number] = line_error(line_number, serializer.errors)
+
+    try:
+        outcomes = create_orders(user, [data for _, data in valid], cards)
+    except InsufficientStock as exc:
+        outcomes = [exc] * len(valid)
+
+    for (line_number, _), outcome in zip(valid, outcomes):
+        if isinstance(outcome, InsufficientStock):
+            results[line_number] = line_error(line_number, {
+                'items': [f"Not enough stock for card {card_id}." for card_id in outcome.card_ids]
+            })
+        else:
+            results[line_number] = {
+                'line': line_number,
+                'status': 'created',
+                'id': outcome.id,
+                'order_number': outcome.order_number,
+                'order_value': str(outcome.order_value),
+            }
+
+    for line_number, _ in chunk:
+        yield results[line_number]
@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import (
+    BENCHMARK_ENDPOINTS, LATENCY_THRESHOLD, MEMORY_THRESHOLD, QUERY_THRESHOLD, APIBenchmark, compare_reports,
+)
+from api.models import Order
+from api.synthetic import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, query counts and peak memory of the API endpoints and compare them to a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generate',
+            action='store_true',
+            help='Generate a synthetic dataset before benchmarking',
+        )
+        parser.add_argument('--users', type=int, default=1000, help='Synthetic users to generate')
+        parser.add_argument('--collections', type=int, default=200, help='Synthetic collections to generate')
+        parser.add_argument('--cards', type=int, default=20000, help='Synthetic cards to generate')
+        parser.add_argument('--orders', type=int, default=100000, help='Synthetic orders to generate')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic dataset')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Timed requests per endpoint',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed requests per endpoint before measuring',
+        )
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Invalidate the dashboard cache sections before every request instead of once per endpoint',
+        )
+        parser.add_argument(
+            '--endpoints',
+            nargs='+',
+            choices=[name for name, *_ in BENCHMARK_ENDPOINTS],
+            help='Only benchmark these endpoints',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--baseline', help='Compare against the JSON report stored in this file')
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Overwrite the baseline file with this run instead of comparing',
+        )
+        parser.add_argument(
+            '--latency-threshold',
+            type=float,
+            default=LATENCY_THRESHOLD,
+            help='Allowed relative p95 latency increase, e.g. 0.2 for 20%%',
+        )
+        parser.add_argument(
+            '--query-threshold',
+            type=int,
+            default=QUERY_THRESHOLD,
+            help='Allowed increase in queries per request',
+        )
+        parser.add_argument(
+            '--memory-threshold',
+            type=float,
+            default=MEMORY_THRESHOLD,
+            help='Allowed relative peak memory increase',
+        )
+
+    def handle(self, *args, **options):
+        if options['update_baseline'] and not options['baseline']:
+            raise CommandError('--update-baseline requires --baseline.')
+
+        if options['generate']:
+            self.stdout.write(f"Generating synthetic dataset (seed {options['seed']})...")
+            counts = SyntheticDataGenerator(seed=options['seed'], progress=self.stdout.write).generate(
+                users=options['users'],
+                collections=options['collections'],
+                cards=options['cards'],
+                orders=options['orders'],
+            )
+            self.stdout.write(', '.join(f'{count} {name}' for name, count in counts.items()))
+        elif not Order.objects.exists():
+            raise CommandError('The database has no orders; run with --generate or seed it first.')
+
+        self.stdout.write('Benchmarking API endpoints...')
+        report = APIBenchmark(
+            requests=options['requests'],
+            warmup=options['warmup'],
+            cold_cache=options['cold_cache'],
+            endpoints=options['endpoints'],
+            progress=self.stdout.write,
+        ).run()
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"  - Report written to {options['output']}")
+
+        if not options['baseline']:
+            self.stdout.write(self.style.SUCCESS('Benchmark complete.'))
+            return
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline'] or not baseline_path.exists():
+            baseline_path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {baseline_path}.'))
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get('dataset') != report['dataset']:
+            self.stdout.write(self.style.WARNING('Dataset differs from the baseline; results may not be comparable.'))
+
+        regressions = compare_reports(
+            report,
+            baseline,
+            latency_threshold=options['latency_threshold'],
+            query_threshold=options['query_threshold'],
+            memory_threshold=options['memory_threshold'],
+        )
+        for name, metric, previous, current in regressions:
+            self.stdout.write(self.style.ERROR(f'  - {name}: {metric} {previous} -> {current}'))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regressions against {baseline_path}.')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}.'))
@@ -0,0 +1,125 @@
+import io
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.models import User, Collection, Card, Order, OrderItem
+from api.renderers import FastJSONParser, FastJSONRenderer, orjson
+from api.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON encode and decode throughput of the API renderers on synthetic orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--orders',
+            type=int,
+            default=10000,
+            help='Number of orders in the benchmark payload',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per renderer; the best run is reported',
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer uses the stdlib fallback.'))
+
+        self.stdout.write(f"Serializing {options['orders']} synthetic orders...")
+        data = OrderSerializer(self.build_orders(options['orders']), many=True).data
+
+        baseline = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != baseline:
+            raise CommandError('FastJSONRenderer output differs from JSONRenderer.')
+        if FastJSONParser().parse(io.BytesIO(baseline)) != JSONParser().parse(io.BytesIO(baseline)):
+            raise CommandError('FastJSONParser output differs from JSONParser.')
+        self.stdout.write(f"  - Payload size: {len(baseline) / 1024 / 1024:.1f} MiB")
+
+        for label, run in (
+            ('render', lambda renderer: renderer.render(data)),
+            ('parse', lambda parser: parser.parse(io.BytesIO(baseline))),
+        ):
+            classes = (JSONRenderer, FastJSONRenderer) if label == 'render' else (JSONParser, FastJSONParser)
+            timings = [self.best_of(options['repeat'], run, cls()) for cls in classes]
+            for cls, seconds in zip(classes, timings):
+                self.stdout.write(
+                    f"  - {label} {cls.__name__}: {seconds * 1000:.1f} ms "
+                    f"({options['orders'] / seconds:,.0f} orders/s)"
+                )
+            self.stdout.write(self.style.SUCCESS(f'{label}: {timings[0] / timings[1]:.1f}x speedup'))
+
+    def best_of(self, repeat, run, target):
+
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            run(target)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def build_orders(self, count):
+
+        rng = random.Random(42)
+        now = timezone.now()
+        user = User(id=1, username='benchmark', email='benchmark@example.com',
+                    first_name='Bench', last_name='Mark', date_joined=now)
+        collection = Collection(id=1, name='Benchmark Collection', description='Synthetic cards',
+                                status='issued', created_by=user, created_at=now, updated_at=now)
+        cards = [
+            Card(
+                id=i,
+                name=f'Card {i}',
+                collection=collection,
+                category='rare',
+                rarity='foil',
+                base_price=Decimal(rng.randint(100, 10000)) / 100,
+                market_price=Decimal(rng.randint(100, 10000)) / 100 if i % 3 else None,
+                stock_quantity=rng.randint(0, 100),
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(1, 201)
+        ]
+
+        orders = []
+        item_id = 0
+        for i in range(1, count + 1):
+            order_date = now - timedelta(minutes=i)
+            order = Order(
+                id=i,
+                order_number=f'ORD-{i:013d}',
+                user=user,
+                status=rng.choice(['processing', 'completed', 'cancelled']),
+                order_date=order_date,
+                created_at=order_date,
+                updated_at=order_date,
+            )
+            items = []
+            for card in rng.sample(cards, rng.randint(1, 4)):
+                item_id += 1
+                quantity = rng.randint(1, 5)
+                items.append(OrderItem(
+                    id=item_id,
+                    order=order,
+                    card=card,
+                    quantity=quantity,
+                    unit_price=card.current_price,
+                    total_price=quantity * card.current_price,
+                ))
+            order.order_value = sum((item.total_price for item in items), Decimal('0'))
+            if order.status == 'completed':
+                order.completed_date = order_date
+            order.item_count = sum(item.quantity for item in items)
+            order._prefetched_objects_cache = {'items': items}
+            orders.append(order)
+        return orders
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import invalidate_sections
+from api.counters import rebuild_counters
+from api.sales import rebuild_sales
+
+
+class Command(BaseCommand):
+    help = 'Recompute dashboard counters from a full scan and fix any drift'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding dashboard counters...')
+
+        drift = rebuild_counters()
+
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"  - {key}: {stored} -> {actual}")
+
+        if drift:
+            self.stdout.write(
+                self.style.WARNING(f'Corrected {len(drift)} drifted counters.')
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS('Dashboard counters are in sync.'))
+
+        self.stdout.write('Rebuilding card sales tallies...')
+        rebuild_sales()
+        invalidate_sections('top_sellers')
+        self.stdout.write(self.style.SUCCESS('Card sales tallies rebuilt.'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import invalidate_sections
+from api.counters import rebuild_counters
+from api.orders import recalculate_order_totals
+from api.sales import rebuild_sales
+
+
+class Command(BaseCommand):
+    help = 'Recompute order item and order totals from item prices in bulk'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Recalculating order totals...')
+
+        items_fixed, orders_fixed = recalculate_order_totals()
+
+        self.stdout.write(f"  - Corrected {items_fixed} order item totals")
+        self.stdout.write(f"  - Corrected {orders_fixed} order values")
+
+        if items_fixed or orders_fixed:
+            rebuild_counters()
+            if items_fixed:
+                rebuild_sales()
+            invalidate_sections('recent_orders', 'top_sellers')
+            self.stdout.write(self.style.WARNING('Order totals corrected and dashboard counters rebuilt.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Order totals are consistent.'))
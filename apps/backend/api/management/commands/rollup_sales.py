@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import SALES_ROLLUP, read_watermark, rollup_sales
+
+
+class Command(BaseCommand):
+    help = 'Refresh the daily sales rollup for days touched since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every day instead of only the days touched since the last run',
+        )
+        parser.add_argument(
+            '--batch-days',
+            type=int,
+            default=None,
+            help='Number of days to recompute per transaction',
+        )
+
+    def handle(self, *args, **options):
+        watermark = read_watermark(SALES_ROLLUP)
+        if options['full'] or watermark is None:
+            self.stdout.write('Rebuilding daily sales rollup...')
+        else:
+            self.stdout.write(f'Rolling up daily sales touched since {watermark.isoformat()}...')
+
+        days = rollup_sales(full=options['full'], batch_days=options['batch_days'])
+
+        if days:
+            self.stdout.write(f"  - Recomputed {len(days)} days from {days[0]} to {days[-1]}")
+            self.stdout.write(self.style.SUCCESS('Daily sales rollup refreshed.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Daily sales rollup is up to date.'))
@@ -1,14 +1,22 @@
-from django.core.management.base import BaseCommand
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta, date
 from decimal import Decimal
 import random
+import time
 
 from api.models import Collection, Card, Order, OrderItem
+from api.resets import reset_data
+from api.synthetic import SYNTHETIC_BATCH_SIZE, SyntheticDataGenerator, parallel_inserts_supported
 
 User = get_user_model()
 
+BULK_OPTIONS = ('users', 'collections', 'cards', 'orders')
+
+CARDS_PER_COLLECTION = 100
+
 
 class Command(BaseCommand):
     help = 'Seed database with sample data for dashboard and orders'
@@ -19,15 +27,34 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument('--users', type=int, help='Bulk mode: number of synthetic users to create')
+        parser.add_argument('--collections', type=int, help='Bulk mode: number of synthetic collections to create')
+        parser.add_argument('--cards', type=int, help='Bulk mode: number of synthetic cards to create')
+        parser.add_argument('--orders', type=int, help='Bulk mode: number of synthetic orders to create')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SYNTHETIC_BATCH_SIZE,
+            help='Bulk mode: rows per bulk_create batch and transaction',
+        )
+        parser.add_argument('--seed', type=int, help='Random seed for reproducible data')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Bulk mode: processes inserting orders in parallel (not supported on SQLite)',
+        )
 
     def handle(self, *args, **options):
         if options['clear']:
-            self.stdout.write('Clearing existing data...')
-            OrderItem.objects.all().delete()
-            Order.objects.all().delete()
-            Card.objects.all().delete()
-            Collection.objects.all().delete()
-            User.objects.filter(is_superuser=False).delete()
+            self.clear_data()
+
+        if any(options[name] is not None for name in BULK_OPTIONS):
+            self.bulk_seed(options)
+            return
+
+        if options['seed'] is not None:
+            random.seed(options['seed'])
 
         self.stdout.write('Starting database seeding...')
         
@@ -43,6 +70,48 @@ class Command(BaseCommand):
             self.style.SUCCESS('Successfully seeded database with sample data!')
         )
 
+    def clear_data(self):
+
+        self.stdout.write('Clearing existing data...')
+        started = time.perf_counter()
+        try:
+            reset_data(progress=self.report_cleared)
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(f'  - Cleared in {time.perf_counter() - started:.2f}s')
+
+    def report_cleared(self, table, rows, seconds):
+        if rows is None:
+            self.stdout.write(f'  - {table}: truncated in {seconds:.2f}s')
+        else:
+            self.stdout.write(f'  - {table}: deleted {rows} rows in {seconds:.2f}s')
+
+    def bulk_seed(self, options):
+
+        counts = {name: options[name] or 0 for name in BULK_OPTIONS}
+        if min(counts.values()) < 0 or options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('Counts must not be negative; --batch-size and --workers must be positive.')
+        if options['collections'] is None and counts['cards']:
+            counts['collections'] = max(counts['cards'] // CARDS_PER_COLLECTION, 1)
+        if options['workers'] > 1 and not parallel_inserts_supported():
+            self.stdout.write(self.style.WARNING('Parallel workers are not supported on this database; using one.'))
+
+        self.stdout.write('Starting bulk database seeding...')
+        started = time.perf_counter()
+        self.create_users()
+        generator = SyntheticDataGenerator(
+            seed=42 if options['seed'] is None else options['seed'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            progress=self.stdout.write,
+        )
+        created = generator.generate(**counts)
+
+        summary = ', '.join(f'{count} {name}' for name, count in created.items())
+        self.stdout.write(
+            self.style.SUCCESS(f'Seeded {summary} in {time.perf_counter() - started:.1f}s.')
+        )
+
     def create_users(self):
 
         self.stdout.write('Creating sample users...')
@@ -84,7 +153,7 @@ class Command(BaseCommand):
         
         collections_data = [
             {
-                'name': 'Team Falcons
+                'name': 'Team Falcons #1',
                 'description': 'First collection featuring Team Falcons esports team',
                 'status': 'in_production',
                 'expected_release_date': date(2024, 2, 15),
@@ -189,7 +258,7 @@ class Command(BaseCommand):
             num_cards = card_counts[i] if i < len(card_counts) else random.randint(3, 12)
             
             for j in range(num_cards):
-                card_name = f"{random.choice(card_names)}
+                card_name = f"{random.choice(card_names)} #{j + 1}"
                 category = random.choice(categories)
                 rarity = random.choice(rarities)
                 
@@ -239,35 +308,26 @@ class Command(BaseCommand):
             user = random.choice(users)
             status_choice = random.choices(order_statuses, weights=status_weights)[0]
             
+            num_items = random.randint(1, 5)
+            selected_cards = random.sample(cards, min(num_items, len(cards)))
+            lines = [(card, random.randint(1, 3), card.current_price) for card in selected_cards]
+            
             order = Order.objects.create(
                 user=user,
                 status=status_choice,
                 order_date=order_date,
                 completed_date=order_date + timedelta(days=random.randint(1, 7)) if status_choice == 'completed' else None,
-                notes=f"Sample order
-                order_value=Decimal('0.00')
+                notes=f"Sample order #{i + 1}",
+                order_value=sum(quantity * unit_price for _, quantity, unit_price in lines)
             )
             
-            num_items = random.randint(1, 5)
-            total_value = 0
-            
-            selected_cards = random.sample(cards, min(num_items, len(cards)))
-            
-            for card in selected_cards:
-                quantity = random.randint(1, 3)
-                unit_price = card.current_price
-                
+            for card, quantity, unit_price in lines:
                 OrderItem.objects.create(
                     order=order,
                     card=card,
                     quantity=quantity,
                     unit_price=unit_price,
                 )
-                
-                total_value += quantity * unit_price
-            
-            order.order_value = total_value
-            order.save()
             
             if (i + 1) % 10 == 0:
                 self.stdout.write(f"  - Created {i + 1} orders...")
@@ -0,0 +1,126 @@
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+BYTES_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+
+COUNTER_SERIES_LIMIT = 1000
+
+OVERFLOW_LABEL = 'other'
+
+HISTOGRAMS = {
+    'api_request_duration_seconds': ('Wall time spent handling a request', SECONDS_BUCKETS),
+    'api_db_queries': ('Database queries executed per request', QUERY_BUCKETS),
+    'api_db_duration_seconds': ('Time spent in database queries per request', SECONDS_BUCKETS),
+    'api_duplicate_queries': ('Repeated executions of an identical SQL statement per request', QUERY_BUCKETS),
+    'api_serializer_duration_seconds': ('Time spent building serializer data per request', SECONDS_BUCKETS),
+    'api_response_bytes': ('Size of the rendered response body', BYTES_BUCKETS),
+}
+
+COUNTERS = {
+    'api_requests_total': 'Requests handled, by response status',
+    'api_repeated_query_total': 'Requests that executed the same SQL statement more than once',
+}
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+
+    def __init__(self, series_limit=COUNTER_SERIES_LIMIT):
+        self.lock = threading.Lock()
+        self.series_limit = series_limit
+        self.histograms = {}
+        self.counters = Counter()
+        self.series = Counter()
+
+    def reset(self):
+
+        with self.lock:
+            self.histograms = {}
+            self.counters = Counter()
+            self.series = Counter()
+
+    def record(self, labels, observations, counters=()):
+
+        labels = tuple(labels.items())
+        with self.lock:
+            for name, value in observations.items():
+                key = (name, labels)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                self.histograms[key].observe(value)
+            for name, extra_labels in counters:
+                key = (name, labels + tuple(extra_labels.items()))
+                if key not in self.counters:
+                    if self.series[name] >= self.series_limit:
+                        key = (name, labels + tuple((label, OVERFLOW_LABEL) for label in extra_labels))
+                    else:
+                        self.series[name] += 1
+                self.counters[key] += 1
+
+    def render(self):
+
+        with self.lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            series = sorted(key for key in histograms if key[0] == name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for key in series:
+                counts, total, count = histograms[key]
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{format_labels(key[1] + (("le", str(bound)),))} {cumulative}')
+                lines.append(f'{name}_sum{format_labels(key[1])} {total}')
+                lines.append(f'{name}_count{format_labels(key[1])} {count}')
+
+        for name, help_text in COUNTERS.items():
+            series = sorted(key for key in counters if key[0] == name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for key in series:
+                lines.append(f'{name}{format_labels(key[1])} {counters[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,142 @@
+import hashlib
+import re
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+from .metrics import registry
+
+
+REPEATED_QUERY_THRESHOLD = 2
+
+STATEMENT_LABEL_LENGTH = 200
+
+METRIC_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+SELECT_LIST = re.compile(r'^SELECT (DISTINCT )?.*? FROM ', re.DOTALL)
+
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+IN_LIST = re.compile(r'\bIN \(%s(?:, %s)*\)')
+
+VALUES_LIST = re.compile(r'\bVALUES \([^()]*\)(?:, \([^()]*\))*')
+
+current_stats = ContextVar('current_stats', default=None)
+
+
+class RequestStats:
+
+    __slots__ = ('queries', 'db_time', 'statements', 'serializer_time', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+
+def timed_data(data):
+
+    def wrapper(self):
+        stats = current_stats.get()
+        if stats is None or stats.serializing:
+            return data.fget(self)
+        stats.serializing = True
+        started = perf_counter()
+        try:
+            return data.fget(self)
+        finally:
+            stats.serializer_time += perf_counter() - started
+            stats.serializing = False
+
+    wrapper.instrumented = True
+    return property(wrapper)
+
+
+def instrument_serializers():
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(serializer_class.data.fget, 'instrumented', False):
+            serializer_class.data = timed_data(serializer_class.data)
+
+
+def normalise_sql(sql):
+
+    sql = SQL_LITERAL.sub('%s', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return VALUES_LIST.sub('VALUES (...)', sql)
+
+
+def fingerprint(sql):
+
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+def statement_label(sql):
+
+    return SELECT_LIST.sub(r'SELECT \1... FROM ', sql, count=1)[:STATEMENT_LABEL_LENGTH]
+
+
+class RequestMetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        if not settings.API_METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+
+        self.record(request, response, stats, perf_counter() - started)
+        return response
+
+    def record(self, request, response, stats, duration):
+        match = request.resolver_match
+        labels = {
+            'view': match.view_name if match else 'unmatched',
+            'method': request.method if request.method in METRIC_METHODS else 'OTHER',
+        }
+        repeated = {sql: count for sql, count in stats.statements.items() if count >= REPEATED_QUERY_THRESHOLD}
+        observations = {
+            'api_request_duration_seconds': duration,
+            'api_db_queries': stats.queries,
+            'api_db_duration_seconds': stats.db_time,
+            'api_duplicate_queries': sum(count - 1 for count in repeated.values()),
+            'api_serializer_duration_seconds': stats.serializer_time,
+        }
+        if not response.streaming:
+            observations['api_response_bytes'] = len(response.content)
+
+        counters = [('api_requests_total', {'status': response.status_code})]
+        statements = dict.fromkeys(normalise_sql(sql) for sql in repeated)
+        counters.extend(
+            ('api_repeated_query_total', {'fingerprint': fingerprint(sql), 'statement': statement_label(sql)})
+            for sql in statements
+        )
+        registry.record(labels, observations, counters)
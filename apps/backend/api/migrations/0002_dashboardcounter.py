@@ -0,0 +1,63 @@
+
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def seed_counters(apps, schema_editor):
+    User = apps.get_model('api', 'User')
+    Collection = apps.get_model('api', 'Collection')
+    Card = apps.get_model('api', 'Card')
+    Order = apps.get_model('api', 'Order')
+    DashboardCounter = apps.get_model('api', 'DashboardCounter')
+
+    order_keys = {
+        'processing': 'pending_orders',
+        'completed': 'completed_orders',
+        'cancelled': 'cancelled_orders',
+    }
+    counters = Order.objects.order_by().aggregate(
+        total_orders=Count('id'),
+        total_revenue=Sum('order_value', filter=Q(status='completed')),
+        **{key: Count('id', filter=Q(status=status)) for status, key in order_keys.items()}
+    )
+    counters['total_revenue'] = counters['total_revenue'] or Decimal('0')
+    counters.update(Collection.objects.order_by().aggregate(
+        total_collections=Count('id'),
+        active_collections=Count('id', filter=Q(status__in=['pending', 'in_production'])),
+        pending_collections=Count('id', filter=Q(status='pending')),
+        in_production_collections=Count('id', filter=Q(status='in_production')),
+        issued_collections=Count('id', filter=Q(status='issued')),
+    ))
+    counters['total_cards'] = Card.objects.count()
+    counters['total_users'] = User.objects.filter(is_active=True).count()
+
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(key=key, value=value) for key, value in counters.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('value', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Counter',
+                'verbose_name_plural': 'Dashboard Counters',
+                'db_table': 'dashboard_counters',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
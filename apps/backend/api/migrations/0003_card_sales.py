@@ -0,0 +1,66 @@
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_sales(apps, schema_editor):
+    OrderItem = apps.get_model('api', 'OrderItem')
+    CardSalesTally = apps.get_model('api', 'CardSalesTally')
+    CardSalesDaily = apps.get_model('api', 'CardSalesDaily')
+
+    items = OrderItem.objects.exclude(order__status='cancelled').order_by()
+    CardSalesTally.objects.bulk_create([
+        CardSalesTally(card_id=row['card'], quantity_sold=row['quantity'], revenue=row['revenue'])
+        for row in items.values('card').annotate(quantity=Sum('quantity'), revenue=Sum('total_price'))
+    ], batch_size=1000)
+    CardSalesDaily.objects.bulk_create([
+        CardSalesDaily(card_id=row['card'], day=row['day'], quantity_sold=row['quantity'], revenue=row['revenue'])
+        for row in items.annotate(day=TruncDate('order__order_date')).values('card', 'day').annotate(
+            quantity=Sum('quantity'), revenue=Sum('total_price')
+        )
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardSalesTally',
+            fields=[
+                ('card', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_tally', serialize=False, to='api.card')),
+                ('quantity_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Card Sales Tally',
+                'verbose_name_plural': 'Card Sales Tallies',
+                'db_table': 'card_sales_tallies',
+                'indexes': [models.Index(fields=['-quantity_sold'], name='card_sales_quantity_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CardSalesDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='api.card')),
+            ],
+            options={
+                'verbose_name': 'Card Daily Sales',
+                'verbose_name_plural': 'Card Daily Sales',
+                'db_table': 'card_sales_daily',
+                'indexes': [models.Index(fields=['day', 'card'], name='card_sales_daily_day_idx')],
+                'unique_together': {('card', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_sales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_card_sales'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='card',
+            options={'ordering': ['collection_id', 'name'], 'verbose_name': 'Card', 'verbose_name_plural': 'Cards'},
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['is_active', 'stock_quantity'], name='cards_active_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collection',
+            index=models.Index(fields=['status', 'created_at'], name='collections_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'order_date'], name='orders_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'order_date'], name='orders_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+
+from django.db import migrations
+
+
+FORWARD_SQL = [
+    """
+    ALTER TABLE collections ADD COLUMN search_vector tsvector
+    """,
+    """
+    ALTER TABLE cards ADD COLUMN search_vector tsvector
+    """,
+    """
+    CREATE FUNCTION collections_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE FUNCTION cards_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(
+                (SELECT name FROM collections WHERE id = NEW.collection_id), ''
+            )), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE FUNCTION collections_refresh_card_search() RETURNS trigger AS $$
+    BEGIN
+        UPDATE cards SET collection_id = collection_id WHERE collection_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER collections_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON collections
+    FOR EACH ROW EXECUTE FUNCTION collections_search_vector_update()
+    """,
+    """
+    CREATE TRIGGER cards_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, collection_id ON cards
+    FOR EACH ROW EXECUTE FUNCTION cards_search_vector_update()
+    """,
+    """
+    CREATE TRIGGER collections_card_search_trigger
+    AFTER UPDATE OF name ON collections
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION collections_refresh_card_search()
+    """,
+    """
+    UPDATE collections SET name = name
+    """,
+    """
+    UPDATE cards SET name = name
+    """,
+    """
+    CREATE INDEX collections_search_vector_idx ON collections USING gin (search_vector)
+    """,
+    """
+    CREATE INDEX cards_search_vector_idx ON cards USING gin (search_vector)
+    """,
+]
+
+REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS collections_card_search_trigger ON collections',
+    'DROP TRIGGER IF EXISTS collections_search_vector_trigger ON collections',
+    'DROP TRIGGER IF EXISTS cards_search_vector_trigger ON cards',
+    'DROP FUNCTION IF EXISTS collections_refresh_card_search()',
+    'DROP FUNCTION IF EXISTS collections_search_vector_update()',
+    'DROP FUNCTION IF EXISTS cards_search_vector_update()',
+    'ALTER TABLE cards DROP COLUMN IF EXISTS search_vector',
+    'ALTER TABLE collections DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(FORWARD_SQL), run_on_postgresql(REVERSE_SQL)),
+    ]
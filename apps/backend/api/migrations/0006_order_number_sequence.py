@@ -0,0 +1,23 @@
+
+from django.db import migrations
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE SEQUENCE IF NOT EXISTS order_number_seq')
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP SEQUENCE IF EXISTS order_number_seq')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_search_vectors'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
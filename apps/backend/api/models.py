@@ -1,10 +1,86 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Coalesce
 from decimal import Decimal
 
-
-class User(AbstractUser):
+from .order_numbers import next_order_number
+
+
+class SnapshotMixin:
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot = dict(zip(field_names, values))
+        return instance
+
+    def loaded_value(self, field_name):
+
+        return getattr(self, '_snapshot', {}).get(field_name)
+
+    def dirty_fields(self):
+
+        snapshot = getattr(self, '_snapshot', None)
+        if snapshot is None or self._state.adding:
+            return None
+        if snapshot.get(self._meta.pk.attname) != self.pk:
+            return None
+
+        changed = []
+        touched = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if getattr(field, 'auto_now', False):
+                touched.append(field.name)
+            elif field.attname not in snapshot or snapshot[field.attname] != getattr(self, field.attname):
+                changed.append(field.name)
+        return changed + touched if changed else []
+
+    def save(self, *args, skip_unchanged=False, **kwargs):
+        if not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            dirty = self.dirty_fields()
+            if dirty == []:
+                if skip_unchanged:
+                    return
+                dirty = self.auto_now_fields() or None
+            if dirty is not None:
+                kwargs['update_fields'] = dirty
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+        self.refresh_snapshot()
+
+    def auto_now_fields(self):
+
+        return [
+            field.name for field in self._meta.concrete_fields
+            if getattr(field, 'auto_now', False) and field.attname in self.__dict__
+        ]
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self.refresh_snapshot()
+            return
+        snapshot = getattr(self, '_snapshot', None)
+        if snapshot is not None:
+            for name in fields:
+                attname = self._meta.get_field(name).attname
+                if attname in self.__dict__:
+                    snapshot[attname] = getattr(self, attname)
+
+    def refresh_snapshot(self):
+
+        self._snapshot = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+
+class User(SnapshotMixin, AbstractUser):
 
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=150)
@@ -30,7 +106,20 @@ class User(AbstractUser):
         return f"{self.first_name} {self.last_name}".strip()
 
 
-class Collection(models.Model):
+class CollectionQuerySet(models.QuerySet):
+
+    def with_card_count(self):
+        return self.select_related('created_by').annotate(card_count=Coalesce(
+            models.Subquery(
+                Card.objects.filter(collection=models.OuterRef('pk')).order_by().values('collection').annotate(
+                    count=models.Count('pk')
+                ).values('count')
+            ),
+            0,
+        ))
+
+
+class Collection(SnapshotMixin, models.Model):
 
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -47,11 +136,16 @@ class Collection(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CollectionQuerySet.as_manager()
+
     class Meta:
         db_table = 'collections'
         verbose_name = 'Collection'
         verbose_name_plural = 'Collections'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='collections_status_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -59,6 +153,9 @@ class Collection(models.Model):
     @property
     def total_cards(self):
 
+        card_count = getattr(self, 'card_count', None)
+        if card_count is not None:
+            return card_count
         return self.cards.count()
 
     @property
@@ -67,7 +164,7 @@ class Collection(models.Model):
         return self.status == 'issued'
 
 
-class Card(models.Model):
+class Card(SnapshotMixin, models.Model):
 
     CATEGORY_CHOICES = [
         ('common', 'Common'),
@@ -100,8 +197,11 @@ class Card(models.Model):
         db_table = 'cards'
         verbose_name = 'Card'
         verbose_name_plural = 'Cards'
-        ordering = ['collection', 'name']
+        ordering = ['collection_id', 'name']
         unique_together = ['collection', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'stock_quantity'], name='cards_active_stock_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.collection.name})"
@@ -117,7 +217,22 @@ class Card(models.Model):
         return self.stock_quantity > 0
 
 
-class Order(models.Model):
+class OrderQuerySet(models.QuerySet):
+
+    def with_details(self):
+        return self.select_related('user').prefetch_related(
+            models.Prefetch('items', queryset=OrderItem.objects.select_related('card__collection'))
+        ).annotate(item_count=Coalesce(
+            models.Subquery(
+                OrderItem.objects.filter(order=models.OuterRef('pk')).order_by().values('order').annotate(
+                    count=models.Count('pk')
+                ).values('count')
+            ),
+            0,
+        ))
+
+
+class Order(SnapshotMixin, models.Model):
 
     STATUS_CHOICES = [
         ('processing', 'Processing'),
@@ -135,24 +250,33 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         db_table = 'orders'
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-order_date']
+        indexes = [
+            models.Index(fields=['status', 'order_date'], name='orders_status_date_idx'),
+            models.Index(fields=['user', 'order_date'], name='orders_user_date_idx'),
+            models.Index(fields=['updated_at'], name='orders_updated_idx'),
+        ]
 
     def __str__(self):
         return f"Order {self.order_number} - {self.user.full_name}"
 
     def save(self, *args, **kwargs):
         if not self.order_number:
-            import uuid
-            self.order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+            self.order_number = next_order_number()
         super().save(*args, **kwargs)
 
     @property
     def total_items(self):
 
+        item_count = getattr(self, 'item_count', None)
+        if item_count is not None:
+            return item_count
         return self.items.count()
 
     @property
@@ -161,7 +285,7 @@ class Order(models.Model):
         return self.status == 'completed'
 
 
-class OrderItem(models.Model):
+class OrderItem(SnapshotMixin, models.Model):
 
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='order_items')
@@ -182,3 +306,102 @@ class OrderItem(models.Model):
     def save(self, *args, **kwargs):
         self.total_price = self.quantity * self.unit_price
         super().save(*args, **kwargs)
+
+
+class CardSalesTally(models.Model):
+
+    card = models.OneToOneField(Card, on_delete=models.CASCADE, primary_key=True, related_name='sales_tally')
+    quantity_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    class Meta:
+        db_table = 'card_sales_tallies'
+        verbose_name = 'Card Sales Tally'
+        verbose_name_plural = 'Card Sales Tallies'
+        indexes = [
+            models.Index(fields=['-quantity_sold'], name='card_sales_quantity_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id}: {self.quantity_sold} sold"
+
+
+class CardSalesDaily(models.Model):
+
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='daily_sales')
+    day = models.DateField()
+    quantity_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    class Meta:
+        db_table = 'card_sales_daily'
+        verbose_name = 'Card Daily Sales'
+        verbose_name_plural = 'Card Daily Sales'
+        unique_together = ['card', 'day']
+        indexes = [
+            models.Index(fields=['day', 'card'], name='card_sales_daily_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id} on {self.day}: {self.quantity_sold} sold"
+
+
+class DashboardCounter(models.Model):
+
+    key = models.CharField(max_length=100, unique=True)
+    value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dashboard_counters'
+        verbose_name = 'Dashboard Counter'
+        verbose_name_plural = 'Dashboard Counters'
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class DailySales(models.Model):
+
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+    items_sold = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_sales'
+        verbose_name = 'Daily Sales'
+        verbose_name_plural = 'Daily Sales'
+        unique_together = ['day', 'status']
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.order_count} orders"
+
+
+class StaleSalesDay(models.Model):
+
+    day = models.DateField(primary_key=True)
+
+    class Meta:
+        db_table = 'stale_sales_days'
+        verbose_name = 'Stale Sales Day'
+        verbose_name_plural = 'Stale Sales Days'
+
+    def __str__(self):
+        return str(self.day)
+
+
+class RollupWatermark(models.Model):
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'rollup_watermarks'
+        verbose_name = 'Rollup Watermark'
+        verbose_name_plural = 'Rollup Watermarks'
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
@@ -0,0 +1,177 @@
+import os
+import random
+import threading
+import time
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+ORDER_NUMBER_PREFIX = 'ORD-'
+
+CROCKFORD_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+EPOCH_MS = 1704067200000
+
+WORKER_BITS = 10
+
+SEQUENCE_BITS = 12
+
+WORKER_LEASE_KEY = 'order_numbers:worker:{}'
+
+WORKER_LEASE_TIMEOUT = 60
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def encode_base32(value, width=13):
+
+    chars = []
+    for _ in range(width):
+        value, remainder = divmod(value, 32)
+        chars.append(CROCKFORD_ALPHABET[remainder])
+    return ''.join(reversed(chars))
+
+
+def shared_cache():
+
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+def lease_worker_id(token):
+
+    if not shared_cache():
+        raise ImproperlyConfigured(
+            'SnowflakeGenerator needs ORDER_NUMBER_WORKER_ID or a shared cache to lease worker ids.'
+        )
+    workers = 1 << WORKER_BITS
+    start = random.randrange(workers)
+    for offset in range(workers):
+        worker_id = (start + offset) % workers
+        if cache.add(WORKER_LEASE_KEY.format(worker_id), token, WORKER_LEASE_TIMEOUT):
+            return worker_id
+    raise ImproperlyConfigured(f'All {workers} order number worker ids are leased.')
+
+
+def renew_worker_lease(worker_id, token):
+
+    key = WORKER_LEASE_KEY.format(worker_id)
+    return cache.get(key) == token and cache.touch(key, WORKER_LEASE_TIMEOUT)
+
+
+class SnowflakeGenerator:
+
+    def __init__(self, worker_id=None):
+        self.configured_worker_id = worker_id if worker_id is not None else settings.ORDER_NUMBER_WORKER_ID
+        self.lock = threading.Lock()
+        self.reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.reset)
+
+    def reset(self):
+        worker_id = self.configured_worker_id
+        self.worker_id = None if worker_id is None else worker_id % (1 << WORKER_BITS)
+        self.lease_token = None
+        self.lease_renewed = None
+        self.last_timestamp = -1
+        self.sequence = 0
+
+    def hold_lease(self):
+
+        now = time.monotonic()
+        if self.lease_renewed is not None and now - self.lease_renewed < WORKER_LEASE_TIMEOUT / 3:
+            return
+        if self.lease_token is None or not renew_worker_lease(self.worker_id, self.lease_token):
+            self.lease_token = uuid.uuid4().hex
+            self.worker_id = lease_worker_id(self.lease_token)
+        self.lease_renewed = now
+
+    def clock(self):
+        return time.time_ns() // 1_000_000
+
+    def next_id(self):
+
+        with self.lock:
+            if self.configured_worker_id is None:
+                self.hold_lease()
+            timestamp = max(self.clock(), self.last_timestamp)
+            if timestamp == self.last_timestamp:
+                self.sequence = (self.sequence + 1) % (1 << SEQUENCE_BITS)
+                if self.sequence == 0:
+                    timestamp += 1
+            else:
+                self.sequence = 0
+            self.last_timestamp = timestamp
+            return (
+                (timestamp - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)
+                | self.worker_id << SEQUENCE_BITS
+                | self.sequence
+            )
+
+    def generate(self):
+
+        return f'{ORDER_NUMBER_PREFIX}{encode_base32(self.next_id())}'
+
+    def generate_many(self, count):
+
+        return [self.generate() for _ in range(count)]
+
+
+class SequenceGenerator:
+
+    sequence_name = 'order_number_seq'
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def generate(self):
+
+        return self.generate_many(1)[0]
+
+    def generate_many(self, count):
+
+        if not count:
+            return []
+        connection = connections[self.using]
+        if connection.vendor != 'postgresql':
+            raise ImproperlyConfigured('SequenceGenerator requires a PostgreSQL database.')
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [self.sequence_name, count])
+            values = sorted(value for value, in cursor.fetchall())
+        return [f'{ORDER_NUMBER_PREFIX}{value:012d}' for value in values]
+
+
+@lru_cache(maxsize=None)
+def get_generator():
+
+    generator_class = import_string(settings.ORDER_NUMBER_GENERATOR)
+    if (generator_class is SnowflakeGenerator and settings.ORDER_NUMBER_WORKER_ID is None
+            and not shared_cache() and connections[DEFAULT_DB_ALIAS].vendor == 'postgresql'):
+        return SequenceGenerator()
+    return generator_class()
+
+
+@receiver(setting_changed)
+def reset_generator(setting, **kwargs):
+    if setting in ('ORDER_NUMBER_GENERATOR', 'ORDER_NUMBER_WORKER_ID'):
+        get_generator.cache_clear()
+
+
+def next_order_number():
+
+    return get_generator().generate()
+
+
+def next_order_numbers(count):
+
+    return get_generator().generate_many(count)
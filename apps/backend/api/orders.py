@@ -0,0 +1,265 @@
+from collections import Counter
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import (
+    Case, Exists, F, IntegerField, OuterRef, Prefetch, Subquery, Sum, Value, When,
+    prefetch_related_objects
+)
+
+from .counters import apply_deltas, order_deltas
+from .dashboard import CENT
+from .models import Card, Order, OrderItem
+from .order_numbers import next_order_numbers
+from .sales import apply_sales, item_rows, orders_rows
+from .signals import invalidate_on_commit
+
+
+ORDER_TRANSITIONS = {
+    'complete': ('processing', 'completed'),
+    'cancel': ('processing', 'cancelled'),
+}
+
+
+class InsufficientStock(Exception):
+
+    def __init__(self, card_ids):
+        self.card_ids = sorted(card_ids)
+        super().__init__(f"Insufficient stock for cards: {', '.join(map(str, self.card_ids))}")
+
+
+def requested_card_ids(items):
+
+    card_ids = set()
+    for item in items if isinstance(items, (list, tuple)) else []:
+        try:
+            card_ids.add(int(item['card_id']))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return card_ids
+
+
+def fetch_cards(card_ids):
+
+    return Card.objects.select_related('collection').in_bulk(card_ids)
+
+
+def _per_card(quantities):
+    return Case(
+        *[When(id=card_id, then=Value(quantity)) for card_id, quantity in quantities.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def item_quantities(items):
+
+    quantities = Counter()
+    for item in items:
+        quantities[item['card_id']] += item['quantity']
+    return quantities
+
+
+def lock_stock(card_ids):
+
+    locked = Card.objects.select_for_update().filter(id__in=sorted(card_ids)).order_by('id')
+    return {
+        card_id: stock if is_active else 0
+        for card_id, stock, is_active in locked.values_list('id', 'stock_quantity', 'is_active')
+    }
+
+
+def decrement_stock(quantities):
+
+    requested = _per_card(quantities)
+    return Card.objects.filter(
+        id__in=sorted(quantities), is_active=True, stock_quantity__gte=requested
+    ).update(stock_quantity=F('stock_quantity') - requested)
+
+
+def reserve_stock(quantities):
+
+    quantities = +Counter(quantities)
+    if not quantities:
+        return
+
+    available = lock_stock(quantities)
+    short = [card_id for card_id in sorted(quantities) if available.get(card_id, 0) < quantities[card_id]]
+    if short:
+        raise InsufficientStock(short)
+    if decrement_stock(quantities) != len(quantities):
+        raise InsufficientStock(quantities)
+
+
+def release_stock(rows):
+
+    quantities = Counter()
+    for card_id, quantity in rows:
+        quantities[card_id] += quantity
+    if not quantities:
+        return
+    Card.objects.filter(id__in=sorted(quantities)).update(
+        stock_quantity=F('stock_quantity') + _per_card(quantities)
+    )
+
+
+def order_total(order_items):
+
+    return sum((order_item.total_price for order_item in order_items), Decimal('0')).quantize(CENT)
+
+
+def build_items(items, cards):
+
+    order_items = []
+    for item in items:
+        card = cards[item['card_id']]
+        unit_price = card.current_price
+        order_items.append(OrderItem(
+            card=card,
+            quantity=item['quantity'],
+            unit_price=unit_price,
+            total_price=item['quantity'] * unit_price,
+        ))
+    return order_items
+
+
+def create_order(user, items, cards=None, **fields):
+
+    if cards is None:
+        cards = fetch_cards(requested_card_ids(items))
+
+    with transaction.atomic():
+        reserve_stock(item_quantities(items))
+        order_items = build_items(items, cards)
+        fields['order_value'] = order_total(order_items)
+        order = Order.objects.create(user=user, **fields)
+        for order_item in order_items:
+            order_item.order = order
+        OrderItem.objects.bulk_create(order_items)
+
+        if order.status != 'cancelled':
+            apply_sales(item_rows(order_items))
+        invalidate_on_commit('recent_orders', 'top_sellers')
+
+    prefetch_related_objects(
+        [order], Prefetch('items', OrderItem.objects.select_related('card__collection'))
+    )
+    return order
+
+
+def create_orders(user, orders, cards):
+
+    requested = Counter()
+    for data in orders:
+        requested.update(item_quantities(data['items']))
+
+    outcomes = [None] * len(orders)
+    with transaction.atomic():
+        available = lock_stock(requested) if requested else {}
+        reserved = Counter()
+        accepted = []
+        for index, data in enumerate(orders):
+            quantities = item_quantities(data['items'])
+            short = [
+                card_id for card_id in sorted(quantities)
+                if available.get(card_id, 0) - reserved[card_id] < quantities[card_id]
+            ]
+            if short:
+                outcomes[index] = InsufficientStock(short)
+                continue
+            reserved.update(quantities)
+            order_items = build_items(data['items'], cards)
+            fields = {key: value for key, value in data.items() if key != 'items'}
+            order = Order(user=user, order_value=order_total(order_items), **fields)
+            accepted.append((index, order, order_items))
+
+        reserved = +reserved
+        if reserved and decrement_stock(reserved) != len(reserved):
+            raise InsufficientStock(reserved)
+
+        order_numbers = next_order_numbers(len(accepted))
+        for (_, order, _), order_number in zip(accepted, order_numbers):
+            order.order_number = order_number
+        Order.objects.bulk_create([order for _, order, _ in accepted])
+        all_items = []
+        deltas = Counter()
+        for index, order, order_items in accepted:
+            for order_item in order_items:
+                order_item.order = order
+            all_items.extend(order_items)
+            deltas.update(order_deltas(order.status, order.order_value))
+            order.refresh_snapshot()
+            outcomes[index] = order
+        OrderItem.objects.bulk_create(all_items)
+
+        apply_deltas(deltas)
+        apply_sales(item_rows(item for item in all_items if item.order.status != 'cancelled'))
+        invalidate_on_commit('order_counters', 'recent_orders', 'top_sellers')
+    return outcomes
+
+
+def complete_order(order):
+
+    transition_orders(Order.objects.filter(pk=order.pk), 'complete')
+    order.refresh_from_db()
+    return order
+
+
+def cancel_order(order):
+
+    transition_orders(Order.objects.filter(pk=order.pk), 'cancel')
+    order.refresh_from_db()
+    return order
+
+
+def recalculate_order_totals():
+
+    line_total = F('quantity') * F('unit_price')
+    item_totals = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order').annotate(
+        total=Sum('total_price')
+    ).values('total')
+    with transaction.atomic():
+        items_fixed = OrderItem.objects.exclude(total_price=line_total).update(total_price=line_total)
+        orders_fixed = Order.objects.filter(
+            Exists(OrderItem.objects.filter(order=OuterRef('pk')))
+        ).exclude(order_value=Subquery(item_totals)).update(
+            order_value=Subquery(item_totals), updated_at=timezone.now()
+        )
+    return items_fixed, orders_fixed
+
+
+def transition_orders(queryset, action):
+
+    source, target = ORDER_TRANSITIONS[action]
+    with transaction.atomic():
+        rows = list(
+            queryset.order_by('id').select_for_update().values_list('id', 'status', 'order_value')
+        )
+        eligible = {order_id: value for order_id, status, value in rows if status == source}
+        statuses = {order_id: status for order_id, status, _ in rows}
+        if not eligible:
+            return set(), statuses
+
+        now = timezone.now()
+        fields = {'status': target, 'updated_at': now}
+        if target == 'completed':
+            fields['completed_date'] = now
+        Order.objects.filter(id__in=eligible, status=source).update(**fields)
+
+        deltas = Counter()
+        for value in eligible.values():
+            deltas.update(order_deltas(target, value))
+            deltas.subtract(order_deltas(source, value))
+        apply_deltas(deltas)
+
+        sections = ['order_counters', 'recent_orders']
+        if target == 'cancelled':
+            sold = list(orders_rows(eligible))
+            release_stock((card_id, quantity) for card_id, _, quantity, _ in sold)
+            apply_sales(sold, sign=-1)
+            sections.append('top_sellers')
+        invalidate_on_commit(*sections)
+
+    statuses.update({order_id: target for order_id in eligible})
+    return set(eligible), statuses
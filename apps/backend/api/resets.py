@@ -0,0 +1,106 @@
+from time import perf_counter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models, transaction
+
+from .cache import invalidate_sections
+from .counters import rebuild_counters
+from .models import (
+    User, Collection, Card, Order, OrderItem, CardSalesTally, CardSalesDaily,
+    DailySales, StaleSalesDay, RollupWatermark,
+)
+
+
+RESET_BATCH_SIZE = 10000
+
+RESET_MODELS = (
+    OrderItem,
+    CardSalesDaily,
+    CardSalesTally,
+    Order,
+    Card,
+    Collection,
+    DailySales,
+    StaleSalesDay,
+    RollupWatermark,
+)
+
+
+def truncate_tables(tables):
+
+    names = ', '.join(connection.ops.quote_name(table) for table in tables)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'TRUNCATE {names} RESTART IDENTITY CASCADE')
+
+
+def delete_in_batches(queryset, batch_size, before_delete=None):
+
+    deleted = 0
+    model = queryset.model
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            if before_delete:
+                before_delete(pks)
+            deleted += model._base_manager.filter(pk__in=pks)._raw_delete(connection.alias)
+
+
+def user_relations():
+
+    relations = []
+    for relation in User._meta.related_objects:
+        if relation.many_to_many or relation.related_model in RESET_MODELS:
+            continue
+        if relation.on_delete not in (models.CASCADE, models.SET_NULL):
+            raise ImproperlyConfigured(
+                f'Cannot reset users: {relation.related_model._meta.label}.{relation.field.name} '
+                f'uses on_delete={relation.on_delete.__name__}, only CASCADE and SET_NULL are handled.'
+            )
+        relations.append(relation)
+    return relations
+
+
+def detach_users(pks):
+
+    for field in User._meta.many_to_many:
+        field.remote_field.through._base_manager.filter(**{f'{field.m2m_field_name()}__in': pks})._raw_delete(
+            connection.alias
+        )
+    for relation in user_relations():
+        related = relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': pks})
+        if relation.on_delete is models.CASCADE:
+            related._raw_delete(connection.alias)
+        else:
+            related.update(**{relation.field.name: None})
+
+
+def reset_data(batch_size=None, progress=None):
+
+    batch_size = batch_size or RESET_BATCH_SIZE
+    progress = progress or (lambda table, rows, seconds: None)
+    user_relations()
+    timings = []
+
+    if connection.vendor == 'postgresql':
+        tables = [model._meta.db_table for model in RESET_MODELS]
+        started = perf_counter()
+        truncate_tables(tables)
+        timings.append((', '.join(tables), None, perf_counter() - started))
+        progress(*timings[-1])
+    else:
+        for model in RESET_MODELS:
+            started = perf_counter()
+            rows = delete_in_batches(model._base_manager.all(), batch_size)
+            timings.append((model._meta.db_table, rows, perf_counter() - started))
+            progress(*timings[-1])
+
+    started = perf_counter()
+    rows = delete_in_batches(User._base_manager.filter(is_superuser=False), batch_size, detach_users)
+    timings.append((User._meta.db_table, rows, perf_counter() - started))
+    progress(*timings[-1])
+
+    rebuild_counters()
+    invalidate_sections('recent_orders', 'top_sellers')
+    return timings
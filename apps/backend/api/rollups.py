@@ -0,0 +1,156 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Trunc, TruncDate
+from django.utils import timezone
+
+from .models import DailySales, Order, OrderItem, RollupWatermark, StaleSalesDay
+
+
+SALES_ROLLUP = 'daily_sales'
+
+ROLLUP_OVERLAP = timedelta(minutes=5)
+
+ROLLUP_BATCH_DAYS = 31
+
+SERIES_GRANULARITIES = ('day', 'week', 'month')
+
+DEFAULT_SERIES_BUCKETS = {'day': 30, 'week': 12, 'month': 12}
+
+MAX_SERIES_BUCKETS = 366
+
+
+def mark_sales_days_stale(days):
+
+    StaleSalesDay.objects.bulk_create([StaleSalesDay(day=day) for day in set(days)], ignore_conflicts=True)
+
+
+def read_watermark(name):
+
+    return RollupWatermark.objects.filter(name=name).values_list('value', flat=True).first()
+
+
+def touched_days(since=None):
+
+    days = set(StaleSalesDay.objects.values_list('day', flat=True))
+    orders = Order.objects.all()
+    if since is None:
+        days.update(DailySales.objects.values_list('day', flat=True).distinct())
+    else:
+        orders = orders.filter(updated_at__gt=since - ROLLUP_OVERLAP)
+    days.update(
+        orders.annotate(day=TruncDate('order_date')).order_by().values_list('day', flat=True).distinct()
+    )
+    return sorted(days)
+
+
+def day_bounds(days):
+
+    return (
+        timezone.make_aware(datetime.combine(min(days), time.min)),
+        timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min)),
+    )
+
+
+def daily_sales_rows(days):
+
+    bounds = day_bounds(days)
+    items_sold = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order').annotate(
+        quantity=Sum('quantity')
+    ).values('quantity')
+    orders = Order.objects.filter(order_date__gte=bounds[0], order_date__lt=bounds[1]).annotate(
+        day=TruncDate('order_date'),
+        item_quantity=Coalesce(Subquery(items_sold), 0),
+    ).filter(day__in=days)
+    return [
+        DailySales(
+            day=row['day'],
+            status=row['status'],
+            order_count=row['order_count'],
+            revenue=row['revenue'] or Decimal('0'),
+            items_sold=row['items_sold'] or 0,
+        )
+        for row in orders.order_by().values('day', 'status').annotate(
+            order_count=Count('id'), revenue=Sum('order_value'), items_sold=Sum('item_quantity')
+        ).order_by('day', 'status')
+    ]
+
+
+def rollup_days(days):
+
+    with transaction.atomic():
+        StaleSalesDay.objects.filter(day__in=days).delete()
+        DailySales.objects.filter(day__in=days).delete()
+        DailySales.objects.bulk_create(daily_sales_rows(days))
+
+
+def rollup_sales(full=False, batch_days=None):
+
+    started = timezone.now()
+    watermark = None if full else read_watermark(SALES_ROLLUP)
+    days = touched_days(watermark)
+    batch_days = batch_days or ROLLUP_BATCH_DAYS
+    for index in range(0, len(days), batch_days):
+        rollup_days(days[index:index + batch_days])
+    RollupWatermark.objects.update_or_create(name=SALES_ROLLUP, defaults={'value': started})
+    return days
+
+
+def bucket_start(day, granularity):
+
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(period, granularity):
+
+    if granularity == 'week':
+        return period + timedelta(days=7)
+    if granularity == 'month':
+        return (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return period + timedelta(days=1)
+
+
+def series_buckets(start, end, granularity):
+
+    period = bucket_start(start, granularity)
+    while period <= end:
+        yield period
+        period = next_bucket(period, granularity)
+
+
+def default_series_start(end, granularity):
+
+    period = bucket_start(end, granularity)
+    for _ in range(DEFAULT_SERIES_BUCKETS[granularity] - 1):
+        period = bucket_start(period - timedelta(days=1), granularity)
+    return period
+
+
+def sales_series(granularity, start, end, statuses=None):
+
+    rows = DailySales.objects.filter(day__range=(start, end))
+    rows = rows.filter(status__in=statuses) if statuses else rows.exclude(status='cancelled')
+    period = F('day') if granularity == 'day' else Trunc('day', granularity, output_field=DateField())
+    totals = {
+        row['period']: row
+        for row in rows.annotate(period=period).order_by().values('period').annotate(
+            order_count=Sum('order_count'), revenue=Sum('revenue'), items_sold=Sum('items_sold')
+        )
+    }
+
+    series = []
+    for bucket in series_buckets(start, end, granularity):
+        row = totals.get(bucket, {})
+        series.append({
+            'period': bucket,
+            'order_count': row.get('order_count', 0),
+            'revenue': row.get('revenue') or Decimal('0'),
+            'items_sold': row.get('items_sold', 0),
+        })
+    return series
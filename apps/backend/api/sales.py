@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Card, CardSalesDaily, CardSalesTally, OrderItem
+
+
+SALES_WINDOWS = (7, 30, 90)
+
+ZERO = Decimal('0')
+
+
+def item_rows(items):
+
+    for item in items:
+        yield (
+            item.card_id,
+            timezone.localdate(item.order.order_date),
+            item.quantity,
+            item.total_price,
+        )
+
+
+def order_rows(order):
+
+    day = timezone.localdate(order.order_date)
+    for card_id, quantity, revenue in order.items.values_list('card_id', 'quantity', 'total_price'):
+        yield card_id, day, quantity, revenue
+
+
+def orders_rows(order_ids):
+
+    items = OrderItem.objects.filter(order_id__in=order_ids).order_by().values_list(
+        'card_id', 'order__order_date', 'quantity', 'total_price'
+    )
+    for card_id, order_date, quantity, revenue in items:
+        yield card_id, timezone.localdate(order_date), quantity, revenue
+
+
+def apply_sales(rows, sign=1):
+
+    totals = defaultdict(lambda: [0, ZERO])
+    daily = defaultdict(lambda: [0, ZERO])
+    for card_id, day, quantity, revenue in rows:
+        for bucket in (totals[(card_id,)], daily[(card_id, day)]):
+            bucket[0] += sign * quantity
+            bucket[1] += sign * revenue
+
+    _increment(CardSalesTally, ('card_id',), totals)
+    _increment(CardSalesDaily, ('card_id', 'day'), daily)
+
+
+def _increment(model, key_fields, deltas):
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    conditions = {key: Q(**dict(zip(key_fields, key))) for key in deltas}
+    matching = reduce(or_, conditions.values())
+    updated = model.objects.filter(matching).update(
+        quantity_sold=F('quantity_sold') + Case(
+            *[When(conditions[key], then=Value(quantity)) for key, (quantity, _) in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        revenue=F('revenue') + Case(
+            *[When(conditions[key], then=Value(revenue)) for key, (_, revenue) in deltas.items()],
+            default=Value(ZERO),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+    if updated < len(deltas):
+        existing = set(model.objects.filter(matching).values_list(*key_fields))
+        missing = {
+            key: delta for key, delta in deltas.items()
+            if key not in existing and (delta[0] > 0 or delta[1] > 0)
+        }
+        model.objects.bulk_create(
+            [model(**dict(zip(key_fields, key))) for key in missing],
+            ignore_conflicts=True,
+        )
+        _increment(model, key_fields, missing)
+
+
+def top_selling_cards(limit=10, days=None):
+
+    if days is None:
+        tallies = CardSalesTally.objects.filter(
+            quantity_sold__gt=0
+        ).select_related('card__collection').order_by('-quantity_sold', 'card_id')[:limit]
+        cards = []
+        for tally in tallies:
+            tally.card.total_sold = tally.quantity_sold
+            tally.card.total_revenue = tally.revenue
+            cards.append(tally.card)
+        return cards
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    ranking = list(
+        CardSalesDaily.objects.filter(day__gte=since).values('card_id').annotate(
+            total_sold=Sum('quantity_sold'),
+            total_revenue=Sum('revenue'),
+        ).filter(total_sold__gt=0).order_by('-total_sold', 'card_id')[:limit]
+    )
+    cards = Card.objects.select_related('collection').in_bulk([row['card_id'] for row in ranking])
+    for row in ranking:
+        cards[row['card_id']].total_sold = row['total_sold']
+        cards[row['card_id']].total_revenue = row['total_revenue']
+    return [cards[row['card_id']] for row in ranking]
+
+
+def rebuild_sales():
+
+    items = OrderItem.objects.exclude(order__status='cancelled').order_by()
+    with transaction.atomic():
+        CardSalesTally.objects.all().delete()
+        CardSalesDaily.objects.all().delete()
+        CardSalesTally.objects.bulk_create([
+            CardSalesTally(card_id=row['card_id'], quantity_sold=row['quantity'], revenue=row['revenue'])
+            for row in items.values('card_id').annotate(
+                quantity=Sum('quantity'), revenue=Sum('total_price')
+            ).iterator()
+        ], batch_size=1000)
+        CardSalesDaily.objects.bulk_create([
+            CardSalesDaily(card_id=row['card_id'], day=row['day'], quantity_sold=row['quantity'], revenue=row['revenue'])
+            for row in items.annotate(day=TruncDate('order__order_date')).values('card_id', 'day').annotate(
+                quantity=Sum('quantity'), revenue=Sum('total_price')
+            ).iterator()
+        ], batch_size=1000)
@@ -0,0 +1,72 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+
+SEARCH_CONFIG = 'simple'
+
+SEARCH_VECTOR_COLUMN = 'search_vector'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def prefix_query(terms):
+
+    words = [word for term in terms for word in WORD_PATTERN.findall(term)]
+    if not words:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        config=SEARCH_CONFIG,
+        search_type='raw',
+    )
+
+
+def search_vector(queryset):
+
+    connection = connections[queryset.db]
+    column = '{}.{}'.format(
+        connection.ops.quote_name(queryset.model._meta.db_table),
+        connection.ops.quote_name(SEARCH_VECTOR_COLUMN),
+    )
+    return RawSQL(column, [], output_field=SearchVectorField())
+
+
+class FullTextSearchFilter(SearchFilter):
+
+    rank_field = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not getattr(view, 'full_text_search', False):
+            return super().filter_queryset(request, queryset, view)
+
+        query = prefix_query(terms)
+        if query is not None and connections[queryset.db].vendor == 'postgresql':
+            vector = search_vector(queryset)
+            queryset = queryset.alias(search_document=vector).filter(search_document=query)
+            queryset = queryset.annotate(**{self.rank_field: SearchRank(vector, query)})
+        else:
+            queryset = super().filter_queryset(request, queryset, view)
+            queryset = queryset.annotate(**{self.rank_field: self.fallback_rank(request, view, terms)})
+
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.order_by(f'-{self.rank_field}', *ordering)
+
+    def fallback_rank(self, request, view, terms):
+        field = self.get_search_fields(view, request)[0].lstrip(''.join(self.lookup_prefixes))
+        return Case(
+            When(Q(**{f'{field}__istartswith': terms[0]}), then=Value(2)),
+            When(reduce(and_, [Q(**{f'{field}__icontains': term}) for term in terms]), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
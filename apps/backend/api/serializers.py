@@ -1,7 +1,13 @@
+from itertools import islice
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.utils import timezone
 from django.contrib.auth.password_validation import validate_password
+from .fieldsets import SparseFieldsetMixin
 from .models import User, Collection, Card, Order, OrderItem
+from .orders import InsufficientStock, create_order, fetch_cards, requested_card_ids
+from .rollups import MAX_SERIES_BUCKETS, SERIES_GRANULARITIES, default_series_start, series_buckets
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -32,7 +38,7 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     full_name = serializers.ReadOnlyField()
 
@@ -41,9 +47,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 
                  'phone_number', 'full_name', 'date_joined')
         read_only_fields = ('id', 'username', 'date_joined')
+        source_fields = {'full_name': ['first_name', 'last_name']}
 
 
-class CollectionSerializer(serializers.ModelSerializer):
+class CollectionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     created_by = UserProfileSerializer(read_only=True)
     total_cards = serializers.ReadOnlyField()
@@ -55,13 +62,14 @@ class CollectionSerializer(serializers.ModelSerializer):
                  'actual_release_date', 'created_by', 'total_cards', 'is_released',
                  'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        source_fields = {'total_cards': [], 'is_released': ['status']}
 
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class CardSerializer(serializers.ModelSerializer):
+class CardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     collection = CollectionSerializer(read_only=True)
     collection_id = serializers.IntegerField(write_only=True)
@@ -74,9 +82,10 @@ class CardSerializer(serializers.ModelSerializer):
                  'category', 'rarity', 'base_price', 'market_price', 'current_price',
                  'stock_quantity', 'is_in_stock', 'is_active', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        source_fields = {'current_price': ['base_price', 'market_price'], 'is_in_stock': ['stock_quantity']}
 
 
-class CardListSerializer(serializers.ModelSerializer):
+class CardListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     collection_name = serializers.CharField(source='collection.name', read_only=True)
     current_price = serializers.ReadOnlyField()
@@ -85,9 +94,20 @@ class CardListSerializer(serializers.ModelSerializer):
         model = Card
         fields = ('id', 'name', 'collection_name', 'category', 'rarity', 
                  'current_price', 'stock_quantity', 'is_active')
+        source_fields = {'current_price': ['base_price', 'market_price']}
+        expandable_fields = {'collection': (CollectionSerializer, {})}
+
+
+class TopSellingCardSerializer(CardListSerializer):
+
+    total_sold = serializers.IntegerField(read_only=True)
+    total_revenue = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
 
+    class Meta(CardListSerializer.Meta):
+        fields = CardListSerializer.Meta.fields + ('total_sold', 'total_revenue')
 
-class OrderItemSerializer(serializers.ModelSerializer):
+
+class OrderItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     card = CardListSerializer(read_only=True)
     card_id = serializers.IntegerField(write_only=True)
@@ -95,19 +115,24 @@ class OrderItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = OrderItem
         fields = ('id', 'card', 'card_id', 'quantity', 'unit_price', 'total_price')
-        read_only_fields = ('id', 'total_price')
+        read_only_fields = ('id', 'unit_price', 'total_price')
+
+    def get_card(self, card_id):
+        cards = self.context.get('cards')
+        if cards is None:
+            return Card.objects.filter(id=card_id).first()
+        return cards.get(card_id)
 
     def validate_card_id(self, value):
-        try:
-            card = Card.objects.get(id=value, is_active=True)
-            if not card.is_in_stock:
-                raise serializers.ValidationError("Card is out of stock.")
-            return value
-        except Card.DoesNotExist:
+        card = self.get_card(value)
+        if card is None or not card.is_active:
             raise serializers.ValidationError("Card not found or inactive.")
+        if not card.is_in_stock:
+            raise serializers.ValidationError("Card is out of stock.")
+        return value
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     user = UserProfileSerializer(read_only=True)
     items = OrderItemSerializer(many=True, read_only=True)
@@ -119,7 +144,9 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ('id', 'order_number', 'user', 'order_value', 'status',
                  'order_date', 'completed_date', 'notes', 'items', 'total_items',
                  'is_completed', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'order_number', 'order_date', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'order_number', 'order_value', 'status', 'order_date', 'completed_date',
+                            'created_at', 'updated_at')
+        source_fields = {'total_items': [], 'is_completed': ['status']}
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
@@ -133,24 +160,52 @@ class OrderCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ('order_value', 'notes', 'items')
+        read_only_fields = ('order_value',)
+
+    def to_internal_value(self, data):
+        if 'cards' not in self.context:
+            items = data.get('items') if hasattr(data, 'get') else None
+            self.context['cards'] = fetch_cards(requested_card_ids(items))
+        return super().to_internal_value(data)
+
+    def validate_items(self, value):
+        if not value:
+            raise serializers.ValidationError("An order must contain at least one item.")
+        card_ids = [item['card_id'] for item in value]
+        if len(card_ids) != len(set(card_ids)):
+            raise serializers.ValidationError("Each card can only appear once per order.")
+        return value
 
     def create(self, validated_data):
         items_data = validated_data.pop('items')
-        order = Order.objects.create(
-            user=self.context['request'].user,
-            **validated_data
-        )
-        
-        for item_data in items_data:
-            card = Card.objects.get(id=item_data['card_id'])
-            OrderItem.objects.create(
-                order=order,
-                card=card,
-                quantity=item_data['quantity'],
-                unit_price=item_data.get('unit_price', card.current_price)
+        try:
+            return create_order(
+                self.context['request'].user,
+                items_data,
+                cards=self.context.get('cards'),
+                **validated_data
             )
-        
-        return order
+        except InsufficientStock as exc:
+            raise serializers.ValidationError({
+                'items': [f"Not enough stock for card {card_id}." for card_id in exc.card_ids]
+            })
+
+
+BULK_ORDER_LIMIT = 1000
+
+
+class BulkOrderActionSerializer(serializers.Serializer):
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=BULK_ORDER_LIMIT
+    )
+    all = serializers.BooleanField(
+        default=False,
+        help_text=f'Confirm a filtered selection that matches more than {BULK_ORDER_LIMIT} orders'
+    )
 
 
 class LoginSerializer(serializers.Serializer):
@@ -179,6 +234,19 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
+class BulkOrderResultSerializer(serializers.Serializer):
+
+    id = serializers.IntegerField()
+    result = serializers.ChoiceField(choices=['updated', 'skipped', 'not_found'])
+    status = serializers.CharField(required=False)
+
+
+class BulkOrderActionResponseSerializer(serializers.Serializer):
+
+    updated = serializers.IntegerField()
+    results = BulkOrderResultSerializer(many=True)
+
+
 class DashboardKPISerializer(serializers.Serializer):
 
     total_orders = serializers.IntegerField()
@@ -189,7 +257,45 @@ class DashboardKPISerializer(serializers.Serializer):
     completed_orders = serializers.IntegerField()
     cancelled_orders = serializers.IntegerField()
     active_collections = serializers.IntegerField()
+    pending_collections = serializers.IntegerField()
+    in_production_collections = serializers.IntegerField()
     issued_collections = serializers.IntegerField()
     total_users = serializers.IntegerField()
     recent_orders = OrderSerializer(many=True)
-    top_selling_cards = CardListSerializer(many=True) 
\ No newline at end of file
+    top_selling_cards = CardListSerializer(many=True) 
+
+
+class SalesSeriesQuerySerializer(serializers.Serializer):
+
+    granularity = serializers.ChoiceField(choices=SERIES_GRANULARITIES, default='day')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    status = serializers.MultipleChoiceField(choices=Order.STATUS_CHOICES, required=False)
+
+    def validate(self, attrs):
+        granularity = attrs['granularity']
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', default_series_start(attrs['end'], granularity))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError('start must be on or before end.')
+        buckets = islice(series_buckets(attrs['start'], attrs['end'], granularity), MAX_SERIES_BUCKETS + 1)
+        if len(list(buckets)) > MAX_SERIES_BUCKETS:
+            raise serializers.ValidationError(f'A series can contain at most {MAX_SERIES_BUCKETS} buckets.')
+        return attrs
+
+
+class SalesSeriesPointSerializer(serializers.Serializer):
+
+    period = serializers.DateField()
+    order_count = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    items_sold = serializers.IntegerField()
+
+
+class SalesSeriesSerializer(serializers.Serializer):
+
+    granularity = serializers.CharField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    as_of = serializers.DateTimeField(allow_null=True)
+    series = SalesSeriesPointSerializer(many=True)
@@ -0,0 +1,131 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_sections
+from .counters import (
+    apply_deltas, card_deltas, collection_deltas, order_deltas, user_deltas
+)
+from .models import User, Collection, Card, Order, OrderItem
+from .rollups import mark_sales_days_stale
+from .sales import apply_sales, item_rows, order_rows
+
+
+def invalidate_on_commit(*sections):
+    transaction.on_commit(partial(invalidate_sections, *sections))
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = order_deltas(instance.status, instance.order_value)
+    if not created:
+        previous_status = instance.loaded_value('status')
+        previous_value = instance.loaded_value('order_value')
+        if previous_status is None:
+            return
+        previous_date = instance.loaded_value('order_date')
+        if previous_date is not None and previous_date != instance.order_date:
+            mark_sales_days_stale([timezone.localdate(previous_date)])
+        if previous_status == instance.status and previous_value == instance.order_value:
+            return
+        deltas.subtract(order_deltas(previous_status, previous_value))
+        if (previous_status == 'cancelled') != (instance.status == 'cancelled'):
+            apply_sales(order_rows(instance), sign=-1 if instance.status == 'cancelled' else 1)
+            invalidate_on_commit('top_sellers')
+    apply_deltas(deltas)
+    invalidate_on_commit('order_counters', 'recent_orders')
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    mark_sales_days_stale([timezone.localdate(instance.order_date)])
+    apply_deltas(order_deltas(instance.status, instance.order_value, sign=-1))
+    invalidate_on_commit('order_counters', 'recent_orders', 'top_sellers')
+
+
+@receiver(post_save, sender=OrderItem)
+def order_item_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or instance.order.status == 'cancelled':
+        return
+    if not created:
+        previous_quantity = instance.loaded_value('quantity')
+        previous_total = instance.loaded_value('total_price')
+        if previous_quantity is None:
+            return
+        apply_sales(
+            [(instance.loaded_value('card_id'), timezone.localdate(instance.order.order_date),
+              previous_quantity, previous_total)],
+            sign=-1,
+        )
+    apply_sales(item_rows([instance]))
+    invalidate_on_commit('recent_orders', 'top_sellers')
+
+
+@receiver(post_delete, sender=OrderItem)
+def order_item_deleted(sender, instance, **kwargs):
+    order = Order.objects.filter(pk=instance.order_id).only('status', 'order_date').first()
+    if order is None or order.status == 'cancelled':
+        return
+    apply_sales(
+        [(instance.card_id, timezone.localdate(order.order_date), instance.quantity, instance.total_price)],
+        sign=-1,
+    )
+    invalidate_on_commit('top_sellers')
+
+
+@receiver(post_save, sender=Collection)
+def collection_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = collection_deltas(instance.status)
+    if not created:
+        previous_status = instance.loaded_value('status')
+        if previous_status is None or previous_status == instance.status:
+            return
+        deltas.subtract(collection_deltas(previous_status))
+    apply_deltas(deltas)
+    invalidate_on_commit('collection_counters')
+
+
+@receiver(post_delete, sender=Collection)
+def collection_deleted(sender, instance, **kwargs):
+    apply_deltas(collection_deltas(instance.status, sign=-1))
+    invalidate_on_commit('collection_counters')
+
+
+@receiver(post_save, sender=Card)
+def card_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_deltas(card_deltas())
+        invalidate_on_commit('collection_counters')
+
+
+@receiver(post_delete, sender=Card)
+def card_deleted(sender, instance, **kwargs):
+    apply_deltas(card_deltas(sign=-1))
+    invalidate_on_commit('collection_counters', 'top_sellers')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = user_deltas(instance.is_active)
+    if not created:
+        was_active = instance.loaded_value('is_active')
+        if was_active is None or was_active == instance.is_active:
+            return
+        deltas.subtract(user_deltas(was_active))
+    apply_deltas(deltas)
+    invalidate_on_commit('user_counters')
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    apply_deltas(user_deltas(instance.is_active, sign=-1))
+    invalidate_on_commit('user_counters')
@@ -0,0 +1,316 @@
+import multiprocessing
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.db.models import IntegerField, Max, Value
+from django.db.models.functions import Cast, StrIndex, Substr
+from django.utils import timezone
+
+from .cache import invalidate_sections
+from .counters import rebuild_counters
+from .models import User, Collection, Card, Order, OrderItem
+from .order_numbers import next_order_numbers
+from .rollups import rollup_sales
+from .sales import rebuild_sales
+
+
+SYNTHETIC_BATCH_SIZE = 5000
+
+SYNTHETIC_USERNAME_PREFIX = 'synthetic_'
+
+SYNTHETIC_PASSWORD = 'password123'
+
+FIRST_NAMES = ['John', 'Jane', 'Mike', 'Sarah', 'Alex', 'Emily', 'Chris', 'Lisa', 'Omar', 'Yuki', 'Ines', 'Ravi']
+
+LAST_NAMES = ['Doe', 'Smith', 'Wilson', 'Johnson', 'Brown', 'Davis', 'Miller', 'Garcia', 'Haddad', 'Sato', 'Costa', 'Patel']
+
+CARD_NAMES = [
+    'Lightning Strike', 'Fire Dragon', 'Ice Wizard', 'Shadow Warrior', 'Golden Phoenix',
+    'Storm Giant', 'Crystal Mage', 'Dark Knight', 'Wind Archer', 'Earth Guardian',
+    'Thunder Lord', 'Frost Queen', 'Flame Soldier', 'Water Sprite', 'Rock Titan',
+    'Sky Rider', 'Ocean Master', 'Mountain King', 'Forest Ranger', 'Desert Nomad'
+]
+
+COLLECTION_THEMES = ['Esport', 'Gaming', 'Legends', 'Champions', 'Arena', 'Tournament']
+
+CATEGORY_PRICES = {
+    'common': (5, 15),
+    'uncommon': (15, 35),
+    'rare': (35, 75),
+    'epic': (75, 150),
+    'legendary': (150, 500),
+}
+
+CATEGORY_WEIGHTS = [40, 30, 17, 9, 4]
+
+RARITY_WEIGHTS = [70, 15, 10, 5]
+
+COLLECTION_STATUS_WEIGHTS = [30, 30, 40]
+
+ORDER_STATUS_WEIGHTS = [20, 70, 10]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def price(rng, low, high):
+    return Decimal(str(round(rng.uniform(low, high), 2)))
+
+
+def highest_suffix(queryset, field, marker, pattern):
+
+    suffix = Cast(Substr(field, StrIndex(field, Value(marker)) + len(marker)), IntegerField())
+    return queryset.filter(**{f'{field}__regex': pattern}).aggregate(highest=Max(suffix))['highest']
+
+
+class SyntheticDataGenerator:
+
+    def __init__(self, seed=42, days=365, batch_size=None, progress=None, workers=1):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.days = days
+        self.batch_size = batch_size or SYNTHETIC_BATCH_SIZE
+        self.progress = progress or (lambda message: None)
+        self.workers = max(workers, 1)
+        self.now = timezone.now()
+
+    def moment(self):
+
+        return self.now - timedelta(seconds=self.rng.randint(0, self.days * 86400))
+
+    def batches(self, count):
+
+        for start in range(0, count, self.batch_size):
+            yield start, min(self.batch_size, count - start)
+
+    def generate(self, users=0, collections=0, cards=0, orders=0, max_items=5):
+
+        with explicit_timestamps(User, Collection, Card, Order):
+            user_ids = self.create_users(users) or list(User.objects.values_list('id', flat=True))
+            collection_ids = (
+                self.create_collections(collections, user_ids)
+                or list(Collection.objects.values_list('id', flat=True))
+            )
+            self.create_cards(cards, collection_ids)
+            order_items = self.create_orders(orders, user_ids, max_items)
+
+        self.progress('Rebuilding counters, sales tallies and rollups...')
+        rebuild_counters()
+        rebuild_sales()
+        rollup_sales(full=True)
+        invalidate_sections('order_counters', 'collection_counters', 'user_counters', 'recent_orders', 'top_sellers')
+        return {
+            'users': users,
+            'collections': collections if collection_ids else 0,
+            'cards': cards if collection_ids else 0,
+            'orders': orders if order_items else 0,
+            'order_items': order_items,
+        }
+
+    def create_users(self, count):
+
+        if not count:
+            return []
+        highest = highest_suffix(
+            User.objects, 'username', SYNTHETIC_USERNAME_PREFIX, rf'^{SYNTHETIC_USERNAME_PREFIX}[0-9]+$'
+        )
+        offset = 0 if highest is None else highest + 1
+        password = make_password(SYNTHETIC_PASSWORD)
+        user_ids = []
+        for start, size in self.batches(count):
+            users = []
+            for index in range(offset + start, offset + start + size):
+                joined = self.moment()
+                users.append(User(
+                    username=f'{SYNTHETIC_USERNAME_PREFIX}{index}',
+                    email=f'{SYNTHETIC_USERNAME_PREFIX}{index}@example.com',
+                    password=password,
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    date_joined=joined,
+                    updated_at=joined,
+                ))
+            user_ids.extend(user.id for user in User.objects.bulk_create(users))
+            self.progress(f'  - Created {start + size} users')
+        return user_ids
+
+    def create_collections(self, count, user_ids):
+
+        if not count:
+            return []
+        statuses = [value for value, _ in Collection.STATUS_CHOICES]
+        offset = highest_suffix(Collection.objects, 'name', ' #', r'^[^#]+ #[0-9]+$') or 0
+        collection_ids = []
+        for start, size in self.batches(count):
+            collections = []
+            for index in range(offset + start, offset + start + size):
+                status = self.rng.choices(statuses, weights=COLLECTION_STATUS_WEIGHTS)[0]
+                created = self.moment()
+                expected = created.date() + timedelta(days=self.rng.randint(14, 120))
+                theme = self.rng.choice(COLLECTION_THEMES)
+                collections.append(Collection(
+                    name=f'{theme} Series #{index + 1}',
+                    description=f'Synthetic {theme.lower()} collection',
+                    status=status,
+                    expected_release_date=expected,
+                    actual_release_date=min(expected + timedelta(days=self.rng.randint(0, 7)), date.today())
+                    if status == 'issued' else None,
+                    created_by_id=self.rng.choice(user_ids) if user_ids else None,
+                    created_at=created,
+                    updated_at=created,
+                ))
+            collection_ids.extend(collection.id for collection in Collection.objects.bulk_create(collections))
+            self.progress(f'  - Created {start + size} collections')
+        return collection_ids
+
+    def create_cards(self, count, collection_ids):
+
+        if not count or not collection_ids:
+            return
+        categories = list(CATEGORY_PRICES)
+        rarities = [value for value, _ in Card.RARITY_CHOICES]
+        offset = highest_suffix(Card.objects, 'name', ' #', r'^[^#]+ #[0-9]+$') or 0
+        for start, size in self.batches(count):
+            cards = []
+            for index in range(offset + start, offset + start + size):
+                category = self.rng.choices(categories, weights=CATEGORY_WEIGHTS)[0]
+                rarity = self.rng.choices(rarities, weights=RARITY_WEIGHTS)[0]
+                low, high = CATEGORY_PRICES[category]
+                if rarity != 'normal':
+                    multiplier = self.rng.uniform(1.5, 3.0)
+                    low, high = low * multiplier, high * multiplier
+                base_price = price(self.rng, low, high)
+                created = self.moment()
+                cards.append(Card(
+                    name=f'{self.rng.choice(CARD_NAMES)} #{index + 1}',
+                    description=f'A {category} {rarity} card',
+                    collection_id=self.rng.choice(collection_ids),
+                    category=category,
+                    rarity=rarity,
+                    base_price=base_price,
+                    market_price=(base_price * Decimal(str(round(self.rng.uniform(0.8, 1.5), 2)))).quantize(Decimal('0.01'))
+                    if self.rng.random() < 0.8 else None,
+                    stock_quantity=self.rng.randint(0, 500),
+                    is_active=self.rng.random() < 0.95,
+                    created_at=created,
+                    updated_at=created,
+                ))
+            Card.objects.bulk_create(cards)
+            self.progress(f'  - Created {start + size} cards')
+
+    def create_orders(self, count, user_ids, max_items=5):
+
+        if not count or not user_ids:
+            return 0
+        cards = [
+            (card_id, market_price or base_price)
+            for card_id, base_price, market_price in Card.objects.values_list('id', 'base_price', 'market_price')
+        ]
+        if not cards:
+            return 0
+        if self.workers > 1 and parallel_inserts_supported():
+            return self.create_orders_in_workers(count, user_ids, cards, max_items)
+        return self.insert_orders(count, user_ids, cards, max_items)
+
+    def create_orders_in_workers(self, count, user_ids, cards, max_items):
+
+        share, extra = divmod(count, self.workers)
+        tasks = []
+        for index in range(self.workers):
+            size = share + (index < extra)
+            if size:
+                tasks.append((
+                    f'{self.seed}-{index}', self.days, self.batch_size, self.now,
+                    size, next_order_numbers(size), user_ids, cards, max_items,
+                ))
+
+        connections.close_all()
+        created_items = created_orders = 0
+        with multiprocessing.get_context('fork').Pool(len(tasks)) as pool:
+            for orders, items in pool.imap_unordered(insert_orders_worker, tasks):
+                created_orders += orders
+                created_items += items
+                self.progress(f'  - Created {created_orders} orders')
+        return created_items
+
+    def insert_orders(self, count, user_ids, cards, max_items=5, order_numbers=None):
+
+        statuses = [value for value, _ in Order.STATUS_CHOICES]
+        created_items = 0
+        for start, size in self.batches(count):
+            orders = []
+            lines = []
+            batch_numbers = order_numbers[start:start + size] if order_numbers else next_order_numbers(size)
+            for order_number in batch_numbers:
+                order_date = self.moment()
+                status = self.rng.choices(statuses, weights=ORDER_STATUS_WEIGHTS)[0]
+                completed = None
+                if status == 'completed':
+                    completed = min(order_date + timedelta(hours=self.rng.randint(1, 168)), self.now)
+                items = [
+                    OrderItem(card_id=card_id, quantity=quantity, unit_price=unit_price, total_price=quantity * unit_price)
+                    for (card_id, unit_price), quantity in (
+                        (card, self.rng.randint(1, 3))
+                        for card in self.rng.sample(cards, min(self.rng.randint(1, max_items), len(cards)))
+                    )
+                ]
+                orders.append(Order(
+                    order_number=order_number,
+                    user_id=self.rng.choice(user_ids),
+                    order_value=sum((item.total_price for item in items), Decimal('0')),
+                    status=status,
+                    order_date=order_date,
+                    completed_date=completed,
+                    created_at=order_date,
+                    updated_at=completed or order_date,
+                ))
+                lines.append(items)
+
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                for order, items in zip(orders, lines):
+                    for item in items:
+                        item.order_id = order.id
+                batch_items = [item for items in lines for item in items]
+                OrderItem.objects.bulk_create(batch_items)
+            created_items += len(batch_items)
+            self.progress(f'  - Created {start + size} orders')
+        return created_items
+
+
+def parallel_inserts_supported():
+
+    return (
+        connection.vendor != 'sqlite'
+        and not connection.in_atomic_block
+        and 'fork' in multiprocessing.get_all_start_methods()
+    )
+
+
+def insert_orders_worker(task):
+
+    seed, days, batch_size, now, count, order_numbers, user_ids, cards, max_items = task
+    generator = SyntheticDataGenerator(seed=seed, days=days, batch_size=batch_size)
+    generator.now = now
+    try:
+        return count, generator.insert_orders(count, user_ids, cards, max_items, order_numbers)
+    finally:
+        connections.close_all()
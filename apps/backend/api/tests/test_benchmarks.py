@@ -0,0 +1,180 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase
+
+from ..benchmarks import APIBenchmark, compare_reports, percentile
+from ..models import User, Collection, Card, Order, OrderItem, DailySales
+from ..synthetic import SyntheticDataGenerator
+
+
+def endpoint_result(p95=10.0, queries=2, memory=100.0, status_code=200):
+    return {
+        'status': status_code,
+        'latency_ms': {'p95': p95},
+        'queries': queries,
+        'peak_memory_kb': memory,
+    }
+
+
+class SyntheticDataGeneratorTest(TestCase):
+
+
+    def test_generates_consistent_dataset(self):
+
+        counts = SyntheticDataGenerator(seed=7, batch_size=4).generate(
+            users=5, collections=3, cards=10, orders=12, max_items=3
+        )
+
+        self.assertEqual(counts['orders'], 12)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Collection.objects.count(), 3)
+        self.assertEqual(Card.objects.count(), 10)
+        self.assertEqual(OrderItem.objects.count(), counts['order_items'])
+        self.assertEqual(Order.objects.values('order_number').distinct().count(), 12)
+        for order in Order.objects.annotate(total=Sum('items__total_price')):
+            self.assertEqual(order.order_value, order.total)
+        self.assertEqual(
+            DailySales.objects.aggregate(total=Sum('order_count'))['total'],
+            12
+        )
+
+    def test_same_seed_reproduces_cards(self):
+
+        SyntheticDataGenerator(seed=3).generate(collections=1, cards=5)
+        first = list(Card.objects.order_by('pk').values_list('name', 'category', 'rarity', 'base_price'))
+        Collection.objects.all().delete()
+
+        SyntheticDataGenerator(seed=3).generate(collections=1, cards=5)
+        second = list(Card.objects.order_by('pk').values_list('name', 'category', 'rarity', 'base_price'))
+
+        self.assertEqual(first, second)
+
+    def test_users_continue_after_existing_synthetic_users(self):
+
+        SyntheticDataGenerator().generate(users=2)
+        SyntheticDataGenerator().generate(users=2)
+
+        self.assertEqual(
+            sorted(User.objects.values_list('username', flat=True)),
+            ['synthetic_0', 'synthetic_1', 'synthetic_2', 'synthetic_3']
+        )
+
+    def test_users_continue_after_deleted_synthetic_users(self):
+
+        SyntheticDataGenerator().generate(users=3)
+        User.objects.filter(username='synthetic_1').delete()
+        SyntheticDataGenerator().generate(users=1)
+
+        self.assertEqual(
+            sorted(User.objects.values_list('email', flat=True)),
+            ['synthetic_0@example.com', 'synthetic_2@example.com', 'synthetic_3@example.com']
+        )
+
+    def test_cards_continue_numbering_in_existing_collections(self):
+
+        SyntheticDataGenerator().generate(collections=1, cards=50)
+        SyntheticDataGenerator().generate(cards=50)
+
+        self.assertEqual(Card.objects.count(), 100)
+        self.assertEqual(Card.objects.filter(name__endswith=' #100').count(), 1)
+
+
+class CompareReportsTest(TestCase):
+
+
+    def test_percentile_uses_nearest_rank(self):
+
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_flags_regressions_beyond_thresholds(self):
+
+        baseline = {'endpoints': {'cards': endpoint_result(), 'orders': endpoint_result()}}
+        report = {'endpoints': {
+            'cards': endpoint_result(p95=14.0, queries=3, memory=200.0),
+            'orders': endpoint_result(p95=11.5, memory=110.0),
+            'profile': endpoint_result(p95=50.0),
+        }}
+
+        self.assertEqual(compare_reports(report, baseline), [
+            ('cards', 'latency_ms.p95', 10.0, 14.0),
+            ('cards', 'queries', 2, 3),
+            ('cards', 'peak_memory_kb', 100.0, 200.0),
+        ])
+        self.assertEqual(
+            compare_reports(report, baseline, latency_threshold=0.5, query_threshold=1, memory_threshold=1.0),
+            []
+        )
+
+    def test_ignores_latency_changes_below_noise_floor(self):
+
+        baseline = {'endpoints': {'profile': endpoint_result(p95=0.5)}}
+        report = {'endpoints': {'profile': endpoint_result(p95=1.2)}}
+
+        self.assertEqual(compare_reports(report, baseline), [])
+
+
+class APIBenchmarkTest(TestCase):
+
+
+    def setUp(self):
+        SyntheticDataGenerator(seed=1).generate(users=3, collections=2, cards=6, orders=8)
+
+    def test_measures_every_endpoint_and_rolls_back(self):
+
+        users = User.objects.count()
+        report = APIBenchmark(requests=2, warmup=0).run()
+
+        self.assertEqual(User.objects.count(), users)
+        self.assertEqual(report['dataset']['orders'], 8)
+        for name, result in report['endpoints'].items():
+            self.assertEqual(result['status'], 200, name)
+            self.assertGreater(result['response_bytes'], 0, name)
+            self.assertGreater(result['peak_memory_kb'], 0, name)
+            self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['max'], name)
+        self.assertGreater(report['endpoints']['orders']['queries'], 0)
+        self.assertIn('order-detail', report['endpoints'])
+
+    def test_keeps_unrelated_cache_entries(self):
+
+        cache.set('benchmark-unrelated', 'kept')
+        report = APIBenchmark(requests=1, warmup=0, cold_cache=True, endpoints=['dashboard-kpis']).run()
+
+        self.assertEqual(report['endpoints']['dashboard-kpis']['status'], 200)
+        self.assertEqual(cache.get('benchmark-unrelated'), 'kept')
+
+    def test_command_saves_and_compares_baseline(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / 'baseline.json'
+            options = {'requests': 1, 'warmup': 0, 'endpoints': ['cards', 'orders'], 'baseline': str(baseline)}
+
+            out = StringIO()
+            call_command('benchmark_api', stdout=out, **options)
+            self.assertIn('Baseline saved', out.getvalue())
+
+            saved = json.loads(baseline.read_text())
+            self.assertEqual(sorted(saved['endpoints']), ['cards', 'orders'])
+            saved['endpoints']['cards']['queries'] = 0
+            baseline.write_text(json.dumps(saved))
+
+            out = StringIO()
+            with self.assertRaisesMessage(CommandError, '1 regressions'):
+                call_command('benchmark_api', stdout=out, latency_threshold=100, memory_threshold=100, **options)
+            self.assertIn('cards: queries 0 ->', out.getvalue())
+
+    def test_command_requires_data(self):
+
+        Order.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, '--generate'):
+            call_command('benchmark_api', stdout=StringIO())
@@ -0,0 +1,66 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..cache import acquire_lock, get_or_compute, release_lock, should_refresh
+
+
+class GetOrComputeTest(SimpleTestCase):
+
+
+    def setUp(self):
+        cache.clear()
+
+    def test_value_is_cached(self):
+
+        compute = mock.Mock(return_value={'total_orders': 1})
+
+        self.assertEqual(get_or_compute('kpis', compute, timeout=60), {'total_orders': 1})
+        self.assertEqual(get_or_compute('kpis', compute, timeout=60), {'total_orders': 1})
+        self.assertEqual(compute.call_count, 1)
+
+    def test_concurrent_misses_compute_once(self):
+
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'fresh'
+
+        def worker():
+            results.append(get_or_compute('kpis', compute, timeout=60))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['fresh'] * 8)
+
+    def test_stale_value_served_while_locked(self):
+
+        cache.set('kpis', ('stale', 1.0, time.time() - 1), 60)
+        token = acquire_lock('kpis')
+        compute = mock.Mock(return_value='fresh')
+
+        self.assertEqual(get_or_compute('kpis', compute, timeout=60), 'stale')
+        compute.assert_not_called()
+
+        release_lock('kpis', token)
+        self.assertEqual(get_or_compute('kpis', compute, timeout=60), 'fresh')
+
+    def test_early_refresh_probability(self):
+
+        now = time.time()
+
+        self.assertFalse(should_refresh(delta=0.1, expiry=now + 300, now=now))
+        self.assertTrue(should_refresh(delta=0.1, expiry=now, now=now))
+        with mock.patch('api.cache.random.random', return_value=0.999999):
+            self.assertTrue(should_refresh(delta=1.0, expiry=now + 5, now=now))
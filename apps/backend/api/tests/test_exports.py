@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import User, Collection, Card, Order, OrderItem
+from ..exports import csv_cell, export_orders
+
+
+class ExportTestCase(APITestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            is_staff=True
+        )
+        self.collection = Collection.objects.create(name='Test Collection', created_by=self.admin)
+        self.cards = [
+            Card.objects.create(
+                name=f'Card {i}',
+                collection=self.collection,
+                base_price=Decimal('10.00'),
+                stock_quantity=i
+            )
+            for i in range(3)
+        ]
+        self.order = Order.objects.create(user=self.user, order_value=Decimal('30.00'), status='completed')
+        OrderItem.objects.create(order=self.order, card=self.cards[0], quantity=1, unit_price=Decimal('10.00'))
+        OrderItem.objects.create(order=self.order, card=self.cards[1], quantity=2, unit_price=Decimal('10.00'))
+        self.empty_order = Order.objects.create(user=self.user, order_value=Decimal('0.00'))
+        self.other_order = Order.objects.create(user=self.admin, order_value=Decimal('5.00'))
+
+    def download(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode(), response
+
+    def test_orders_csv_has_one_row_per_item(self):
+
+        self.client.force_authenticate(user=self.user)
+        content, response = self.download(reverse('order-export'))
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('filename="orders.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['id'] for row in rows], [str(self.order.id)] * 2 + [str(self.empty_order.id)])
+        self.assertEqual(rows[0]['order_value'], '30.00')
+        self.assertEqual(rows[1]['item_card_name'], 'Card 1')
+        self.assertEqual(rows[1]['item_total_price'], '20.00')
+        self.assertEqual(rows[2]['item_id'], '')
+
+    def test_orders_ndjson_nests_items(self):
+
+        self.client.force_authenticate(user=self.admin)
+        content, response = self.download(reverse('order-export'), output='ndjson')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        documents = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [document['id'] for document in documents],
+            [self.order.id, self.empty_order.id, self.other_order.id]
+        )
+        self.assertEqual(documents[0]['user_email'], 'test@example.com')
+        self.assertEqual(
+            [(item['card_id'], item['quantity'], item['unit_price']) for item in documents[0]['items']],
+            [(self.cards[0].id, 1, '10.00'), (self.cards[1].id, 2, '10.00')]
+        )
+        self.assertTrue(documents[0]['order_date'].endswith('Z'))
+        self.assertEqual(documents[1]['items'], [])
+
+    def test_orders_export_applies_list_filters(self):
+
+        self.client.force_authenticate(user=self.admin)
+        content, _ = self.download(reverse('order-export'), output='ndjson', status='completed')
+
+        self.assertEqual([json.loads(line)['id'] for line in content.splitlines()], [self.order.id])
+
+    def test_orders_export_streams_in_one_query_per_chunk(self):
+
+        with self.assertNumQueries(1):
+            lines = list(export_orders(Order.objects.all(), 'ndjson', chunk_size=1))
+
+        self.assertEqual(len(lines), 3)
+
+    def test_cards_csv(self):
+
+        self.client.force_authenticate(user=self.user)
+        content, _ = self.download(reverse('card-export'), stock_quantity__gte=1)
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['name'] for row in rows], ['Card 1', 'Card 2'])
+        self.assertEqual(rows[0]['collection_name'], 'Test Collection')
+        self.assertEqual(rows[0]['market_price'], '')
+
+    def test_csv_neutralises_formula_cells(self):
+
+        self.client.force_authenticate(user=self.user)
+        Order.objects.filter(pk=self.order.pk).update(notes='=HYPERLINK("http://evil")')
+        Card.objects.filter(pk=self.cards[0].pk).update(name='@SUM(A1)')
+
+        orders, _ = self.download(reverse('order-export'))
+        cards, _ = self.download(reverse('card-export'))
+
+        self.assertEqual(list(csv.DictReader(io.StringIO(orders)))[0]['notes'], '\'=HYPERLINK("http://evil")')
+        self.assertEqual(list(csv.DictReader(io.StringIO(cards)))[0]['name'], "'@SUM(A1)")
+        self.assertEqual(csv_cell('-12.50'), '-12.50')
+        self.assertEqual(csv_cell('-1+2'), "'-1+2")
+
+    def test_empty_csv_export_has_header(self):
+
+        self.client.force_authenticate(user=self.user)
+        content, _ = self.download(reverse('card-export'), category='legendary')
+
+        self.assertEqual(content.splitlines(), [content.splitlines()[0]])
+        self.assertTrue(content.startswith('id,name,collection_id'))
+
+    def test_unknown_output_is_rejected(self):
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('card-export'), {'output': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
@@ -0,0 +1,137 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import User, Collection, Card
+from ..metrics import MetricsRegistry, registry
+from ..middleware import normalise_sql
+
+
+class MetricsRegistryTest(TestCase):
+
+
+    def test_histograms_render_cumulative_buckets(self):
+
+        metrics = MetricsRegistry()
+        labels = {'view': 'card-list', 'method': 'GET'}
+        metrics.record(labels, {'api_db_queries': 1})
+        metrics.record(labels, {'api_db_queries': 3}, [('api_requests_total', {'status': 200})])
+
+        output = metrics.render()
+
+        self.assertIn('# TYPE api_db_queries histogram', output)
+        self.assertIn('api_db_queries_bucket{view="card-list",method="GET",le="1"} 1', output)
+        self.assertIn('api_db_queries_bucket{view="card-list",method="GET",le="5"} 2', output)
+        self.assertIn('api_db_queries_bucket{view="card-list",method="GET",le="+Inf"} 2', output)
+        self.assertIn('api_db_queries_sum{view="card-list",method="GET"} 4', output)
+        self.assertIn('api_requests_total{view="card-list",method="GET",status="200"} 1', output)
+
+    def test_label_values_are_escaped(self):
+
+        metrics = MetricsRegistry()
+        metrics.record({'statement': 'SELECT "a"\n\\'}, {'api_db_queries': 1})
+
+        self.assertIn('statement="SELECT \\"a\\"\\n\\\\"', metrics.render())
+
+    def test_counter_series_are_capped(self):
+
+        metrics = MetricsRegistry(series_limit=2)
+        labels = {'view': 'card-list'}
+        for fingerprint in ('a', 'b', 'c', 'd'):
+            metrics.record(labels, {}, [('api_repeated_query_total', {'fingerprint': fingerprint})])
+
+        output = metrics.render()
+
+        self.assertIn('api_repeated_query_total{view="card-list",fingerprint="b"} 1', output)
+        self.assertNotIn('fingerprint="c"', output)
+        self.assertIn('api_repeated_query_total{view="card-list",fingerprint="other"} 2', output)
+
+    def test_normalise_sql_collapses_lists_and_literals(self):
+
+        self.assertEqual(
+            normalise_sql('SELECT "cards"."id" FROM "cards" WHERE "cards"."id" IN (%s, %s, %s) LIMIT 21'),
+            'SELECT "cards"."id" FROM "cards" WHERE "cards"."id" IN (...) LIMIT %s'
+        )
+        self.assertEqual(
+            normalise_sql('SELECT "cards"."id" FROM "cards" WHERE "cards"."id" IN (%s)'),
+            normalise_sql('SELECT "cards"."id" FROM "cards" WHERE "cards"."id" IN (%s, %s)')
+        )
+        self.assertEqual(
+            normalise_sql('INSERT INTO "t2" ("a", "b") VALUES (%s, \'x\'), (%s, 3)'),
+            'INSERT INTO "t2" ("a", "b") VALUES (...)'
+        )
+
+
+class RequestMetricsMiddlewareTest(APITestCase):
+
+
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123',
+            is_staff=True
+        )
+        collection = Collection.objects.create(name='Test Collection', created_by=self.admin)
+        for i in range(3):
+            Card.objects.create(
+                name=f'Card {i}',
+                collection=collection,
+                base_price=Decimal('10.00'),
+                stock_quantity=1
+            )
+
+    def scrape(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_records_per_view_stats(self):
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('card-list'))
+
+        output = self.scrape()
+        labels = 'view="card-list",method="GET"'
+        self.assertIn(f'api_request_duration_seconds_count{{{labels}}} 1', output)
+        self.assertIn(f'api_db_queries_count{{{labels}}} 1', output)
+        self.assertIn(f'api_serializer_duration_seconds_count{{{labels}}} 1', output)
+        self.assertIn(f'api_response_bytes_sum{{{labels}}} {len(response.content)}', output)
+        self.assertIn(f'api_requests_total{{{labels},status="200"}} 1', output)
+
+    def test_detects_repeated_queries(self):
+
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('card-low-stock'))
+
+        output = self.scrape()
+        labels = 'view="card-low-stock",method="GET"'
+        self.assertIn(f'api_duplicate_queries_sum{{{labels}}} 2', output)
+        self.assertIn(f'api_repeated_query_total{{{labels},fingerprint="', output)
+        self.assertIn('statement="SELECT ... FROM \\"collections\\" WHERE', output)
+
+    def test_metrics_are_staff_only(self):
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(API_METRICS_ENABLED=False)
+    def test_can_be_disabled(self):
+
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('card-list'))
+
+        self.assertEqual(registry.render(), '\n')
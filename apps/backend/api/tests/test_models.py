@@ -1,11 +1,21 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.db.models.signals import post_save
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from decimal import Decimal
 from datetime import date, timedelta
 from django.utils import timezone
+from django.core.management import call_command
+from io import StringIO
 
-from ..models import User, Collection, Card, Order, OrderItem
+from ..models import (
+    User, Collection, Card, Order, OrderItem, DashboardCounter, CardSalesTally, CardSalesDaily
+)
+from ..counters import read_counters
+from ..dashboard import dashboard_counters
+from ..sales import rebuild_sales, top_selling_cards
 
 User = get_user_model()
 
@@ -242,7 +252,10 @@ class OrderModelTest(TestCase):
 
         order = Order.objects.create(**self.order_data)
         self.assertTrue(order.order_number.startswith('ORD-'))
-        self.assertEqual(len(order.order_number), 12)
+        self.assertEqual(len(order.order_number), 17)
+        
+        later = Order.objects.create(**self.order_data)
+        self.assertGreater(later.order_number, order.order_number)
 
     def test_order_str_representation(self):
 
@@ -354,4 +367,257 @@ class OrderItemModelTest(TestCase):
         duplicate_data['quantity'] = 3
         
         with self.assertRaises(Exception):
-            OrderItem.objects.create(**duplicate_data) 
\ No newline at end of file
+            OrderItem.objects.create(**duplicate_data) 
+
+class DirtyFieldTrackingTest(TestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            password='testpass123'
+        )
+        self.order = Order.objects.create(
+            user=self.user,
+            order_value=Decimal('100.00'),
+            notes='Leave at the door'
+        )
+
+    def updates(self, queries, table):
+        return [q['sql'] for q in queries if q['sql'].startswith(f'UPDATE "{table}"')]
+
+    def test_save_updates_only_changed_columns(self):
+
+        order = Order.objects.get(pk=self.order.pk)
+        order.status = 'completed'
+        order.completed_date = timezone.now()
+        with CaptureQueriesContext(connection) as queries:
+            order.save()
+        
+        sql, = self.updates(queries, 'orders')
+        assignments = sql.split(' SET ')[1].split(' WHERE ')[0]
+        self.assertIn('"status"', assignments)
+        self.assertIn('"completed_date"', assignments)
+        self.assertIn('"updated_at"', assignments)
+        self.assertNotIn('"notes"', assignments)
+        self.assertNotIn('"order_value"', assignments)
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'completed')
+
+    def test_unchanged_save_can_be_skipped(self):
+
+        order = Order.objects.get(pk=self.order.pk)
+        with CaptureQueriesContext(connection) as queries:
+            order.save(skip_unchanged=True)
+        
+        self.assertEqual(self.updates(queries, 'orders'), [])
+
+    def test_unchanged_save_touches_row_and_sends_signal(self):
+
+        order = Order.objects.get(pk=self.order.pk)
+        updated_at = order.updated_at
+        saved = []
+        post_save.connect(lambda sender, instance, **kwargs: saved.append(instance.pk), sender=Order, weak=False,
+                          dispatch_uid='snapshot-touch-test')
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                order.save()
+        finally:
+            post_save.disconnect(sender=Order, dispatch_uid='snapshot-touch-test')
+        
+        sql, = self.updates(queries, 'orders')
+        self.assertEqual(sql.split(' SET ')[1].split(' WHERE ')[0].split(' = ')[0], '"updated_at"')
+        self.assertEqual(saved, [order.pk])
+        self.assertGreater(Order.objects.get(pk=order.pk).updated_at, updated_at)
+
+    def test_refresh_from_db_resets_snapshot(self):
+
+        order = Order.objects.get(pk=self.order.pk)
+        Order.objects.filter(pk=order.pk).update(notes='Changed elsewhere')
+        order.refresh_from_db()
+        order.status = 'completed'
+        with CaptureQueriesContext(connection) as queries:
+            order.save()
+        
+        sql, = self.updates(queries, 'orders')
+        self.assertNotIn('"notes"', sql)
+        self.assertEqual(Order.objects.get(pk=order.pk).notes, 'Changed elsewhere')
+
+    def test_created_instance_tracks_later_changes(self):
+
+        self.order.notes = 'Ring twice'
+        with CaptureQueriesContext(connection) as queries:
+            self.order.save()
+        
+        sql, = self.updates(queries, 'orders')
+        self.assertIn('"notes"', sql)
+        self.assertNotIn('"status"', sql)
+
+    def test_explicit_update_fields_are_respected(self):
+
+        order = Order.objects.get(pk=self.order.pk)
+        order.notes = 'Changed'
+        order.status = 'cancelled'
+        with CaptureQueriesContext(connection) as queries:
+            order.save(update_fields=['notes'])
+        
+        sql, = self.updates(queries, 'orders')
+        self.assertNotIn('"status"', sql)
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'processing')
+
+
+class DashboardCounterTest(TestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            password='testpass123'
+        )
+        self.collection = Collection.objects.create(
+            name='Test Collection',
+            created_by=self.user
+        )
+
+    def test_counters_match_full_scan(self):
+
+        Card.objects.create(name='Card', collection=self.collection, base_price=Decimal('10.00'))
+        Order.objects.create(user=self.user, order_value=Decimal('25.00'), status='completed')
+        Order.objects.create(user=self.user, order_value=Decimal('10.00'))
+        
+        self.assertEqual(read_counters(), dashboard_counters())
+
+    def test_status_change_moves_counters(self):
+
+        order = Order.objects.create(user=self.user, order_value=Decimal('40.00'))
+        self.assertEqual(read_counters()['pending_orders'], 1)
+        
+        order = Order.objects.get(pk=order.pk)
+        order.status = 'completed'
+        order.save()
+        
+        counters = read_counters()
+        self.assertEqual(counters['pending_orders'], 0)
+        self.assertEqual(counters['completed_orders'], 1)
+        self.assertEqual(counters['total_revenue'], Decimal('40.00'))
+        
+        order.status = 'cancelled'
+        order.save()
+        
+        counters = read_counters()
+        self.assertEqual(counters['completed_orders'], 0)
+        self.assertEqual(counters['cancelled_orders'], 1)
+        self.assertEqual(counters['total_revenue'], Decimal('0.00'))
+        self.assertEqual(counters['total_orders'], 1)
+
+    def test_cascading_delete_updates_counters(self):
+
+        Card.objects.create(name='Card 1', collection=self.collection, base_price=Decimal('10.00'))
+        Card.objects.create(name='Card 2', collection=self.collection, base_price=Decimal('10.00'))
+        self.assertEqual(read_counters()['total_cards'], 2)
+        
+        self.collection.delete()
+        
+        counters = read_counters()
+        self.assertEqual(counters['total_cards'], 0)
+        self.assertEqual(counters['total_collections'], 0)
+        self.assertEqual(counters['pending_collections'], 0)
+
+    def test_user_deactivation_updates_counters(self):
+
+        self.assertEqual(read_counters()['total_users'], 1)
+        
+        self.user.is_active = False
+        self.user.save()
+        
+        self.assertEqual(read_counters()['total_users'], 0)
+
+    def test_rebuild_counters_command_fixes_drift(self):
+
+        Order.objects.create(user=self.user, order_value=Decimal('10.00'))
+        DashboardCounter.objects.filter(key='total_orders').update(value=Decimal('99'))
+        
+        out = StringIO()
+        call_command('rebuild_counters', stdout=out)
+        
+        self.assertIn('total_orders: 99.00 -> 1', out.getvalue())
+        self.assertEqual(read_counters(), dashboard_counters())
+
+
+class CardSalesTallyTest(TestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            password='testpass123'
+        )
+        self.collection = Collection.objects.create(
+            name='Test Collection',
+            created_by=self.user
+        )
+        self.card = Card.objects.create(
+            name='Test Card',
+            collection=self.collection,
+            base_price=Decimal('10.00')
+        )
+        self.other_card = Card.objects.create(
+            name='Other Card',
+            collection=self.collection,
+            base_price=Decimal('5.00')
+        )
+        self.order = Order.objects.create(
+            user=self.user,
+            order_value=Decimal('35.00')
+        )
+        OrderItem.objects.create(order=self.order, card=self.card, quantity=3, unit_price=Decimal('10.00'))
+        OrderItem.objects.create(order=self.order, card=self.other_card, quantity=1, unit_price=Decimal('5.00'))
+
+    def test_items_update_tally_and_daily_bucket(self):
+
+        tally = CardSalesTally.objects.get(card=self.card)
+        self.assertEqual(tally.quantity_sold, 3)
+        self.assertEqual(tally.revenue, Decimal('30.00'))
+        
+        bucket = CardSalesDaily.objects.get(card=self.card)
+        self.assertEqual(bucket.day, timezone.localdate(self.order.order_date))
+        self.assertEqual(bucket.quantity_sold, 3)
+
+    def test_ranking_orders_by_quantity(self):
+
+        self.assertEqual(top_selling_cards(), [self.card, self.other_card])
+        self.assertEqual(top_selling_cards(days=7), [self.card, self.other_card])
+        self.assertEqual(top_selling_cards(limit=1)[0].total_sold, 3)
+
+    def test_cancelling_order_removes_sales(self):
+
+        self.order.status = 'cancelled'
+        self.order.save()
+        
+        self.assertEqual(top_selling_cards(), [])
+        self.assertEqual(top_selling_cards(days=30), [])
+
+    def test_deleting_order_removes_sales(self):
+
+        self.order.delete()
+        
+        self.assertEqual(top_selling_cards(), [])
+
+    def test_rebuild_matches_incremental_tally(self):
+
+        expected = list(CardSalesTally.objects.order_by('card_id').values_list('card_id', 'quantity_sold', 'revenue'))
+        
+        rebuild_sales()
+        
+        actual = list(CardSalesTally.objects.order_by('card_id').values_list('card_id', 'quantity_sold', 'revenue'))
+        self.assertEqual(actual, expected)
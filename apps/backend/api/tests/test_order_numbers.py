@@ -0,0 +1,124 @@
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..order_numbers import (
+    WORKER_LEASE_KEY, SequenceGenerator, SnowflakeGenerator, get_generator, next_order_number
+)
+
+
+def lease_holders():
+    return {worker_id for worker_id in range(1024) if cache.get(WORKER_LEASE_KEY.format(worker_id))}
+
+
+class SnowflakeGeneratorTest(SimpleTestCase):
+
+
+    def test_numbers_are_unique_and_ordered(self):
+
+        generator = SnowflakeGenerator(worker_id=1)
+        numbers = generator.generate_many(10000)
+
+        self.assertEqual(len(set(numbers)), len(numbers))
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertTrue(all(len(number) == 17 for number in numbers))
+
+    def test_sequence_overflow_borrows_next_millisecond(self):
+
+        generator = SnowflakeGenerator(worker_id=1)
+        with mock.patch.object(generator, 'clock', return_value=1767225600000):
+            numbers = generator.generate_many(5000)
+
+        self.assertEqual(len(set(numbers)), 5000)
+        self.assertEqual(numbers, sorted(numbers))
+
+    def test_clock_moving_backwards_stays_monotonic(self):
+
+        generator = SnowflakeGenerator(worker_id=1)
+        with mock.patch.object(generator, 'clock', side_effect=[1767225600000, 1767225599000]):
+            first, second = generator.generate_many(2)
+
+        self.assertGreater(second, first)
+
+    def test_workers_never_collide(self):
+
+        generators = [SnowflakeGenerator(worker_id=worker_id) for worker_id in range(4)]
+        numbers = set()
+        for generator in generators:
+            with mock.patch.object(generator, 'clock', return_value=1767225600000):
+                numbers.update(generator.generate_many(100))
+
+        self.assertEqual(len(numbers), 400)
+
+    @override_settings(ORDER_NUMBER_WORKER_ID=None)
+    def test_processes_lease_distinct_worker_ids_from_shared_cache(self):
+
+        cache.clear()
+        with mock.patch('api.order_numbers.LOCAL_CACHE_BACKENDS', ()):
+            generators = [SnowflakeGenerator() for _ in range(3)]
+            for generator in generators:
+                generator.generate()
+
+        self.assertEqual({generator.worker_id for generator in generators}, lease_holders())
+        self.assertEqual(len(lease_holders()), 3)
+        generators[0].reset()
+        self.assertIsNone(generators[0].worker_id)
+
+    @override_settings(ORDER_NUMBER_WORKER_ID=None)
+    def test_lost_lease_is_replaced_before_generating(self):
+
+        cache.clear()
+        with mock.patch('api.order_numbers.LOCAL_CACHE_BACKENDS', ()):
+            generator = SnowflakeGenerator()
+            generator.generate()
+            lost = generator.worker_id
+            cache.set(WORKER_LEASE_KEY.format(lost), 'another-process')
+            generator.generate()
+            self.assertEqual(generator.worker_id, lost)
+
+            generator.lease_renewed -= 60
+            generator.generate()
+
+        self.assertNotEqual(generator.worker_id, lost)
+        self.assertEqual(cache.get(WORKER_LEASE_KEY.format(generator.worker_id)), generator.lease_token)
+
+    @override_settings(ORDER_NUMBER_WORKER_ID=None)
+    def test_local_cache_without_worker_id_fails_loudly(self):
+
+        with self.assertRaisesMessage(ImproperlyConfigured, 'ORDER_NUMBER_WORKER_ID'):
+            SnowflakeGenerator().generate()
+
+    @override_settings(ORDER_NUMBER_WORKER_ID=None)
+    def test_local_cache_on_postgresql_falls_back_to_sequence(self):
+
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertIsInstance(get_generator(), SequenceGenerator)
+
+    @override_settings(ORDER_NUMBER_GENERATOR='api.order_numbers.SequenceGenerator')
+    def test_generator_is_configurable(self):
+
+        self.assertIsInstance(get_generator(), SequenceGenerator)
+
+
+class SequenceGeneratorTest(TestCase):
+
+
+    @skipUnless(connection.vendor == 'postgresql', 'Order number sequences require PostgreSQL')
+    @override_settings(ORDER_NUMBER_GENERATOR='api.order_numbers.SequenceGenerator')
+    def test_numbers_come_from_sequence(self):
+
+        first = next_order_number()
+        batch = SequenceGenerator().generate_many(3)
+
+        self.assertEqual(len(set([first] + batch)), 4)
+        self.assertEqual(batch, sorted(batch))
+        self.assertLess(first, batch[0])
+
+    @skipUnless(connection.vendor != 'postgresql', 'Only other backends reject sequences')
+    def test_requires_postgresql(self):
+
+        with self.assertRaises(ImproperlyConfigured):
+            SequenceGenerator().generate()
@@ -0,0 +1,230 @@
+import threading
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from ..models import User, Collection, Card, Order, OrderItem
+from ..counters import read_counters
+from ..dashboard import dashboard_counters
+from ..orders import InsufficientStock, cancel_order, complete_order, create_order, recalculate_order_totals
+
+
+class StockReservationTest(TestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.collection = Collection.objects.create(
+            name='Test Collection',
+            created_by=self.user
+        )
+        self.card = Card.objects.create(
+            name='Test Card',
+            collection=self.collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=5
+        )
+        self.other_card = Card.objects.create(
+            name='Other Card',
+            collection=self.collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=1
+        )
+
+    def order(self, *lines):
+        return create_order(
+            self.user,
+            [{'card_id': card.id, 'quantity': quantity, 'unit_price': Decimal('10.00')} for card, quantity in lines]
+        )
+
+    def test_create_order_decrements_stock(self):
+
+        self.order((self.card, 3), (self.other_card, 1))
+
+        self.card.refresh_from_db()
+        self.other_card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 2)
+        self.assertEqual(self.other_card.stock_quantity, 0)
+
+    def test_order_value_is_computed_from_items(self):
+
+        order = self.order((self.card, 3), (self.other_card, 1))
+
+        order.refresh_from_db()
+        self.assertEqual(order.order_value, Decimal('40.00'))
+
+    def test_insufficient_stock_rolls_back_whole_order(self):
+
+        with self.assertRaises(InsufficientStock) as raised:
+            self.order((self.card, 3), (self.other_card, 2))
+
+        self.assertEqual(raised.exception.card_ids, [self.other_card.id])
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 5)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+
+    def test_cancel_restocks_once(self):
+
+        order = self.order((self.card, 3))
+
+        cancel_order(order)
+        cancel_order(order)
+
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 5)
+        self.assertEqual(read_counters(), dashboard_counters())
+
+    def test_cancel_uses_locked_status_not_stale_instance(self):
+
+        order = self.order((self.card, 3))
+        Order.objects.filter(pk=order.pk).update(status='completed')
+
+        cancel_order(order)
+
+        self.assertEqual(order.status, 'completed')
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 2)
+        self.assertEqual(Order.objects.get(pk=order.pk).status, 'completed')
+
+    def test_complete_uses_locked_status_not_stale_instance(self):
+
+        order = self.order((self.card, 3))
+        cancel_order(Order.objects.get(pk=order.pk))
+
+        complete_order(order)
+
+        self.assertEqual(order.status, 'cancelled')
+        self.assertIsNone(order.completed_date)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 5)
+        self.assertEqual(read_counters(), dashboard_counters())
+
+
+class RecalculateOrderTotalsTest(TestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        collection = Collection.objects.create(name='Test Collection', created_by=self.user)
+        self.card = Card.objects.create(
+            name='Test Card',
+            collection=collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=50
+        )
+        self.orders = []
+        for _ in range(3):
+            order = Order.objects.create(user=self.user, order_value=Decimal('1.00'), status='completed')
+            OrderItem.objects.create(order=order, card=self.card, quantity=2, unit_price=Decimal('7.50'))
+            self.orders.append(order)
+        OrderItem.objects.filter(order=self.orders[0]).update(total_price=Decimal('1.00'))
+        self.empty_order = Order.objects.create(user=self.user, order_value=Decimal('5.00'))
+
+    def test_recalculate_fixes_items_and_orders_in_bulk(self):
+
+        with self.assertNumQueries(4):
+            items_fixed, orders_fixed = recalculate_order_totals()
+
+        self.assertEqual((items_fixed, orders_fixed), (1, 3))
+        for order in self.orders:
+            order.refresh_from_db()
+            self.assertEqual(order.order_value, Decimal('15.00'))
+        self.empty_order.refresh_from_db()
+        self.assertEqual(self.empty_order.order_value, Decimal('5.00'))
+        self.assertEqual(recalculate_order_totals(), (0, 0))
+
+    def test_command_rebuilds_revenue_counter(self):
+
+        out = StringIO()
+        call_command('recalculate_order_totals', stdout=out)
+
+        self.assertIn('Corrected 3 order values', out.getvalue())
+        self.assertEqual(read_counters(['total_revenue'])['total_revenue'], Decimal('45.00'))
+
+
+class ConcurrentReservationTest(TransactionTestCase):
+
+
+    threads = 8
+
+    def setUp(self):
+        if not connection.features.has_select_for_update:
+            self.skipTest('Concurrent reservations need row locking, which this database does not support')
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        collection = Collection.objects.create(name='Stress Collection', created_by=self.user)
+        self.cards = [
+            Card.objects.create(
+                name=f'Stress Card {i}',
+                collection=collection,
+                base_price=Decimal('10.00'),
+                stock_quantity=10
+            )
+            for i in range(2)
+        ]
+
+    def run_checkouts(self, lines_for):
+        barrier = threading.Barrier(self.threads)
+        outcomes = []
+
+        def checkout(index):
+            try:
+                barrier.wait()
+                create_order(self.user, lines_for(index))
+                outcomes.append(True)
+            except InsufficientStock:
+                outcomes.append(False)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=checkout, args=(i,)) for i in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return outcomes
+
+    def test_concurrent_checkouts_never_oversell(self):
+
+        def lines_for(index):
+            cards = self.cards if index % 2 else list(reversed(self.cards))
+            return [{'card_id': card.id, 'quantity': 3, 'unit_price': Decimal('10.00')} for card in cards]
+
+        outcomes = self.run_checkouts(lines_for)
+
+        self.assertEqual(len(outcomes), self.threads)
+        self.assertEqual(outcomes.count(True), 3)
+        for card in self.cards:
+            card.refresh_from_db()
+            self.assertEqual(card.stock_quantity, 1)
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_concurrent_checkouts_lose_no_updates(self):
+
+        def lines_for(index):
+            return [{'card_id': self.cards[0].id, 'quantity': 1, 'unit_price': Decimal('10.00')}]
+
+        outcomes = self.run_checkouts(lines_for)
+
+        self.assertEqual(outcomes, [True] * self.threads)
+        self.cards[0].refresh_from_db()
+        self.assertEqual(self.cards[0].stock_quantity, 10 - self.threads)
+        self.assertEqual(
+            sum(OrderItem.objects.filter(card=self.cards[0]).values_list('quantity', flat=True)),
+            self.threads
+        )
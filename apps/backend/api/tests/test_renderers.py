@@ -0,0 +1,145 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from ..models import User, Collection, Card, Order, OrderItem
+from ..renderers import FastJSONParser, FastJSONRenderer, orjson
+from ..serializers import CardListSerializer, OrderSerializer
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastJSONRendererTest(TestCase):
+
+
+    def assertSameOutput(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type, renderer_context), expected)
+
+    def test_serializer_output_is_identical(self):
+
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        collection = Collection.objects.create(name='Test Collection', created_by=user)
+        card = Card.objects.create(
+            name='Test Card',
+            collection=collection,
+            base_price=Decimal('10.00'),
+            market_price=Decimal('12.50'),
+            stock_quantity=5
+        )
+        order = Order.objects.create(user=user, order_value=Decimal('25.00'), status='completed')
+        OrderItem.objects.create(order=order, card=card, quantity=2, unit_price=Decimal('12.50'))
+
+        data = {
+            'orders': OrderSerializer(Order.objects.all(), many=True).data,
+            'cards': CardListSerializer(Card.objects.select_related('collection'), many=True).data,
+        }
+        self.assertSameOutput(data)
+        self.assertIn(b'"order_value":"25.00"', FastJSONRenderer().render(data))
+
+    def test_python_values_match_drf_encoder(self):
+
+        self.assertSameOutput({
+            'decimal': Decimal('12.50'),
+            'small_decimal': Decimal('1E-7'),
+            'large_decimal': Decimal('1E+16'),
+            'utc': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'offset': datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone(timedelta(hours=2))),
+            'naive': datetime(2024, 1, 2, 3, 4, 5),
+            'date': date(2024, 1, 2),
+            'time': time(3, 4, 5, 600),
+            'duration': timedelta(days=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Orders'),
+            'tuple': (1, 2),
+            'big': 2 ** 70,
+            1: 'integer key',
+        })
+
+    def test_unicode_and_line_separators(self):
+
+        self.assertSameOutput({'name': 'Café \u2028 line \u2029 paragraph ✓'})
+        self.assertIn(b'\\u2028', FastJSONRenderer().render({'name': '\u2028'}))
+
+    def test_indent_and_empty_responses(self):
+
+        self.assertSameOutput({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertSameOutput({'a': [1, 2]}, renderer_context={'indent': 2})
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_non_finite_decimal_raises_like_drf(self):
+
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'value': Decimal('NaN')})
+        with self.assertRaises(ValueError):
+            FastJSONRenderer().render({'value': Decimal('NaN')})
+
+    def test_falls_back_without_orjson(self):
+
+        data = {'value': Decimal('1.50'), 'when': datetime(2024, 1, 2, tzinfo=dt_timezone.utc)}
+        with mock.patch('api.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": 1}')), {'a': 1})
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastJSONParserTest(TestCase):
+
+
+    def test_parses_like_drf(self):
+
+        body = '{"items": [{"card_id": 1, "quantity": 2}], "price": 1.5, "big": %d, "name": "Café"}' % 2 ** 70
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body.encode())),
+            JSONParser().parse(io.BytesIO(body.encode()))
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+
+        for body in (b'', b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_other_encodings_use_stdlib(self):
+
+        body = '{"name": "Café"}'.encode('latin-1')
+        parsed = FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(parsed, {'name': 'Café'})
+
+
+class FastJSONAPITest(APITestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def test_api_round_trip(self):
+
+        response = self.client.put(
+            reverse('user-profile'),
+            data='{"first_name": "Ünïcode"}',
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['first_name'], 'Ünïcode')
+
+    def test_benchmark_command(self):
+
+        out = io.StringIO()
+        call_command('benchmark_renderers', orders=50, repeat=1, stdout=out)
+
+        self.assertIn('render FastJSONRenderer', out.getvalue())
+        self.assertIn('parse FastJSONParser', out.getvalue())
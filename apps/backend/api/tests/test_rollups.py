@@ -0,0 +1,220 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import User, Collection, Card, Order, OrderItem, DailySales, StaleSalesDay
+from ..rollups import daily_sales_rows, rollup_sales
+
+
+def at_noon(day):
+    return timezone.make_aware(datetime.combine(day, time(12)))
+
+
+class SalesRollupFixture:
+
+    days = [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 9)]
+
+    def create_sales(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        collection = Collection.objects.create(name='Test Collection', created_by=self.user)
+        self.card = Card.objects.create(
+            name='Test Card',
+            collection=collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=100
+        )
+        self.orders = []
+        for day, order_status, quantity in (
+            (self.days[0], 'completed', 2),
+            (self.days[0], 'completed', 1),
+            (self.days[0], 'cancelled', 5),
+            (self.days[1], 'processing', 3),
+            (self.days[2], 'completed', 4),
+        ):
+            order = Order.objects.create(
+                user=self.user,
+                order_value=Decimal('10.00') * quantity,
+                status=order_status
+            )
+            OrderItem.objects.create(order=order, card=self.card, quantity=quantity, unit_price=Decimal('10.00'))
+            Order.objects.filter(pk=order.pk).update(
+                order_date=at_noon(day), updated_at=timezone.now() - timedelta(days=1)
+            )
+            self.orders.append(order)
+
+    def rollup_row(self, day, order_status):
+        return DailySales.objects.filter(day=day, status=order_status).values_list(
+            'order_count', 'revenue', 'items_sold'
+        ).first()
+
+
+class RollupSalesTest(SalesRollupFixture, TestCase):
+
+
+    def setUp(self):
+        self.create_sales()
+
+    def test_first_run_rolls_up_every_day(self):
+
+        self.assertEqual(rollup_sales(), self.days)
+
+        self.assertEqual(self.rollup_row(self.days[0], 'completed'), (2, Decimal('30.00'), 3))
+        self.assertEqual(self.rollup_row(self.days[0], 'cancelled'), (1, Decimal('50.00'), 5))
+        self.assertEqual(self.rollup_row(self.days[1], 'processing'), (1, Decimal('30.00'), 3))
+        self.assertEqual(DailySales.objects.count(), 4)
+
+    def test_incremental_run_only_reprocesses_touched_days(self):
+
+        rollup_sales()
+        self.assertEqual(rollup_sales(), [])
+
+        order = Order.objects.get(pk=self.orders[3].pk)
+        order.status = 'completed'
+        order.save()
+
+        self.assertEqual(rollup_sales(), [self.days[1]])
+        self.assertIsNone(self.rollup_row(self.days[1], 'processing'))
+        self.assertEqual(self.rollup_row(self.days[1], 'completed'), (1, Decimal('30.00'), 3))
+
+    def test_deleted_orders_mark_their_day_stale(self):
+
+        rollup_sales()
+        Order.objects.filter(pk=self.orders[4].pk).delete()
+
+        self.assertTrue(StaleSalesDay.objects.filter(day=self.days[2]).exists())
+        self.assertEqual(rollup_sales(), [self.days[2]])
+        self.assertFalse(DailySales.objects.filter(day=self.days[2]).exists())
+        self.assertFalse(StaleSalesDay.objects.exists())
+
+    def test_moved_orders_refresh_both_days(self):
+
+        rollup_sales()
+        order = Order.objects.get(pk=self.orders[4].pk)
+        order.order_date = at_noon(self.days[1])
+        order.save()
+
+        self.assertEqual(rollup_sales(), [self.days[1], self.days[2]])
+        self.assertEqual(self.rollup_row(self.days[1], 'completed'), (1, Decimal('40.00'), 4))
+        self.assertIsNone(self.rollup_row(self.days[2], 'completed'))
+
+    def test_full_rebuild_fixes_drift(self):
+
+        rollup_sales()
+        DailySales.objects.update(order_count=0)
+        DailySales.objects.create(day=date(2023, 12, 31), status='completed', order_count=9)
+
+        rollup_sales(full=True)
+
+        self.assertEqual(self.rollup_row(self.days[0], 'completed'), (2, Decimal('30.00'), 3))
+        self.assertFalse(DailySales.objects.filter(day=date(2023, 12, 31)).exists())
+
+    def test_orders_and_items_are_summed_in_one_statement(self):
+
+        empty = Order.objects.create(user=self.user, order_value=Decimal('5.00'), status='completed')
+        Order.objects.filter(pk=empty.pk).update(order_date=at_noon(self.days[1]))
+
+        with self.assertNumQueries(1):
+            rows = daily_sales_rows(self.days[:2])
+
+        self.assertEqual(
+            [(row.day, row.status, row.order_count, row.revenue, row.items_sold) for row in rows],
+            [
+                (self.days[0], 'cancelled', 1, Decimal('50.00'), 5),
+                (self.days[0], 'completed', 2, Decimal('30.00'), 3),
+                (self.days[1], 'completed', 1, Decimal('5.00'), 0),
+                (self.days[1], 'processing', 1, Decimal('30.00'), 3),
+            ]
+        )
+
+    def test_command(self):
+
+        out = StringIO()
+        call_command('rollup_sales', batch_days=1, stdout=out)
+
+        self.assertIn('Recomputed 3 days from 2024-01-01 to 2024-01-09', out.getvalue())
+        self.assertEqual(DailySales.objects.count(), 4)
+
+        out = StringIO()
+        call_command('rollup_sales', stdout=out)
+        self.assertIn('up to date', out.getvalue())
+
+
+class SalesSeriesViewTest(SalesRollupFixture, APITestCase):
+
+
+    def setUp(self):
+        self.create_sales()
+        rollup_sales()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('dashboard-sales-series')
+
+    def test_daily_series_fills_empty_days(self):
+
+        response = self.client.get(self.url, {'start': '2024-01-01', 'end': '2024-01-03'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['granularity'], 'day')
+        self.assertIsNotNone(response.data['as_of'])
+        self.assertEqual(
+            [(point['period'], point['order_count'], point['revenue'], point['items_sold'])
+             for point in response.data['series']],
+            [('2024-01-01', 2, '30.00', 3), ('2024-01-02', 1, '30.00', 3), ('2024-01-03', 0, '0.00', 0)]
+        )
+
+    def test_weekly_and_monthly_buckets(self):
+
+        response = self.client.get(self.url, {'granularity': 'week', 'start': '2024-01-01', 'end': '2024-01-14'})
+        self.assertEqual(
+            [(point['period'], point['order_count']) for point in response.data['series']],
+            [('2024-01-01', 3), ('2024-01-08', 1)]
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'granularity': 'month', 'start': '2023-12-01', 'end': '2024-01-31'})
+        self.assertEqual(
+            [(point['period'], point['revenue']) for point in response.data['series']],
+            [('2023-12-01', '0.00'), ('2024-01-01', '100.00')]
+        )
+
+    def test_status_filter_includes_cancelled(self):
+
+        response = self.client.get(self.url, {'start': '2024-01-01', 'end': '2024-01-01', 'status': 'cancelled'})
+
+        self.assertEqual(response.data['series'][0]['order_count'], 1)
+        self.assertEqual(response.data['series'][0]['items_sold'], 5)
+
+    def test_default_range_ends_today(self):
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['series']), 30)
+        self.assertEqual(response.data['end'], timezone.localdate().isoformat())
+
+    def test_invalid_ranges_are_rejected(self):
+
+        for params in (
+            {'start': '2024-02-01', 'end': '2024-01-01'},
+            {'start': '2020-01-01', 'end': '2024-01-01'},
+            {'granularity': 'hour'},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,99 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import Group
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, models
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..dashboard import dashboard_counters
+from ..models import User, Collection, Card, Order, OrderItem, CardSalesTally, DailySales
+from ..resets import reset_data
+
+
+class SeedDataBulkTest(TestCase):
+
+
+    def test_bulk_mode_creates_requested_volumes(self):
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as captured:
+            call_command('seed_data', users=20, cards=250, orders=300, batch_size=100, seed=5, stdout=out)
+
+        inserts = [query['sql'] for query in captured if query['sql'].startswith('INSERT INTO "orders"')]
+        self.assertEqual(len(inserts), 3)
+
+        self.assertIn('Seeded 20 users, 2 collections, 250 cards, 300 orders', out.getvalue())
+        self.assertTrue(User.objects.filter(is_superuser=True).exists())
+        self.assertEqual(User.objects.filter(username__startswith='synthetic_').count(), 20)
+        self.assertEqual(Collection.objects.count(), 2)
+        self.assertEqual(Card.objects.count(), 250)
+        self.assertEqual(Order.objects.count(), 300)
+        self.assertTrue(OrderItem.objects.exists())
+
+    def test_bulk_mode_is_reproducible(self):
+
+        call_command('seed_data', users=3, collections=1, cards=4, orders=5, seed=9, stdout=StringIO())
+        first = list(Order.objects.order_by('pk').values_list('order_value', 'status'))
+
+        call_command('seed_data', clear=True, users=3, collections=1, cards=4, orders=5, seed=9, stdout=StringIO())
+        second = list(Order.objects.order_by('pk').values_list('order_value', 'status'))
+
+        self.assertEqual(first, second)
+
+    def test_rejects_invalid_counts(self):
+
+        with self.assertRaises(CommandError):
+            call_command('seed_data', orders=-1, stdout=StringIO())
+
+
+class SeedDataClearTest(TestCase):
+
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin123')
+        call_command('seed_data', users=4, cards=6, orders=10, stdout=StringIO())
+        self.user = User.objects.filter(is_superuser=False).first()
+        self.user.groups.add(Group.objects.create(name='buyers'))
+        LogEntry.objects.create(user=self.user, action_flag=1, object_repr='card')
+        LogEntry.objects.create(user=self.admin, action_flag=1, object_repr='card')
+
+    def test_clear_keeps_superusers_and_empties_tables(self):
+
+        out = StringIO()
+        reset_data(batch_size=3, progress=lambda *row: out.write(f'{row}\n'))
+
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['admin'])
+        for model in (OrderItem, Order, Card, Collection, DailySales, CardSalesTally):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertEqual(list(LogEntry.objects.values_list('user_id', flat=True)), [self.admin.pk])
+        self.assertTrue(Group.objects.filter(name='buyers').exists())
+        self.assertEqual(dashboard_counters()['total_orders'], 0)
+        self.assertEqual(dashboard_counters()['total_users'], 1)
+        self.assertIn("('orders', 10,", out.getvalue())
+
+    def test_command_reports_per_table_timing(self):
+
+        out = StringIO()
+        call_command('seed_data', clear=True, orders=0, stdout=out)
+
+        self.assertRegex(out.getvalue(), r'order_items: deleted \d+ rows in \d+\.\d\ds')
+        self.assertIn('users: deleted 12 rows', out.getvalue())
+        self.assertFalse(Order.objects.exists())
+
+    def test_unhandled_user_relation_aborts_before_deleting(self):
+
+        users = User.objects.count()
+        relation = LogEntry._meta.get_field('user').remote_field
+        with patch.object(relation, 'on_delete', models.PROTECT):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'admin.LogEntry.user uses on_delete=PROTECT'):
+                reset_data()
+            with self.assertRaisesMessage(CommandError, 'only CASCADE and SET_NULL are handled'):
+                call_command('seed_data', clear=True, orders=0, stdout=StringIO())
+
+        self.assertEqual(Order.objects.count(), 10)
+        self.assertEqual(User.objects.count(), users)
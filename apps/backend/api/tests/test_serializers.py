@@ -291,8 +291,9 @@ class OrderSerializerTest(TestCase):
             context={'request': self.request}
         )
         self.assertTrue(serializer.is_valid())
+        self.assertNotIn('order_value', serializer.validated_data)
         
-        order = serializer.save()
+        order = serializer.save(order_value=Decimal('100.00'))
         self.assertEqual(order.user, self.user)
 
 
@@ -1,6 +1,13 @@
+import json
+
 from django.test import TestCase
+from unittest import skipUnless
+from unittest.mock import patch
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -8,6 +15,11 @@ from decimal import Decimal
 from datetime import date, timedelta
 
 from ..models import User, Collection, Card, Order, OrderItem
+from ..cache import section_keys
+from ..counters import read_counters
+from ..dashboard import dashboard_counters
+from ..orders import create_order, create_orders
+from ..views import DashboardKPIsView
 
 User = get_user_model()
 
@@ -167,6 +179,21 @@ class UserProfileTestCase(APITestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.first_name, 'Updated')
 
+    def test_update_user_profile_writes_only_changed_columns(self):
+
+        url = reverse('user-profile')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(url, {'first_name': 'Updated', 'last_name': 'User'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "users"')]
+        self.assertEqual(len(updates), 1)
+        assignments = updates[0].split(' SET ')[1].split(' WHERE ')[0]
+        self.assertEqual(
+            sorted(column.split(' = ')[0] for column in assignments.split(', ')),
+            ['"first_name"', '"updated_at"']
+        )
+
     def test_profile_requires_authentication(self):
 
         self.client.force_authenticate(user=None)
@@ -210,6 +237,74 @@ class CollectionViewSetTestCase(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Test Collection')
 
+    def test_list_collections_query_count_is_constant(self):
+
+        for i in range(5):
+            collection = Collection.objects.create(name=f'Collection {i}', created_by=self.other_user)
+            for j in range(i):
+                Card.objects.create(name=f'Card {j}', collection=collection, base_price=Decimal('10.00'))
+        
+        url = reverse('collection-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(
+            sorted(collection['total_cards'] for collection in response.data['results']),
+            [0, 0, 1, 2, 3, 4]
+        )
+        self.assertEqual(response.data['results'][-1]['created_by']['id'], self.user.id)
+
+    def test_admin_changelist_annotates_card_count(self):
+
+        admin_user = User.objects.create_superuser(
+            username='superuser',
+            email='super@example.com',
+            password='superpass123'
+        )
+        for i in range(3):
+            collection = Collection.objects.create(name=f'Collection {i}', created_by=self.other_user)
+            Card.objects.create(name='Card', collection=collection, base_price=Decimal('10.00'))
+        self.client.force_login(admin_user)
+        
+        url = reverse('admin:api_collection_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries if 'SELECT COUNT(*) AS "__count" FROM "cards"' in q['sql']])
+
+    def test_filter_search_and_order_collections(self):
+
+        Collection.objects.create(name='Alpha Set', status='issued', created_by=self.user)
+        Collection.objects.create(name='Beta Set', status='issued', created_by=self.user)
+        
+        url = reverse('collection-list')
+        response = self.client.get(url, {'status': 'issued', 'ordering': '-name'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Beta Set', 'Alpha Set'])
+        
+        response = self.client.get(url, {'search': 'alpha'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Alpha Set'])
+
+    def test_sparse_fieldset_on_collections(self):
+
+        url = reverse('collection-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,name,total_cards'})
+        
+        self.assertEqual(response.data['results'], [{'id': self.collection.id, 'name': 'Test Collection', 'total_cards': 0}])
+        select = [q['sql'] for q in queries if q['sql'].startswith('SELECT "collections"."id"')][0]
+        self.assertNotIn('"collections"."description"', select)
+
+    def test_search_collections_ranks_name_matches_first(self):
+
+        Collection.objects.create(name='Mixed Set', description='Includes dragon variants', created_by=self.user)
+        Collection.objects.create(name='Dragon Set', created_by=self.user)
+        
+        url = reverse('collection-list')
+        response = self.client.get(url, {'search': 'drag'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Dragon Set', 'Mixed Set'])
+
     def test_create_collection(self):
 
         url = reverse('collection-list')
@@ -362,6 +457,90 @@ class CardViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_filter_cards_by_stock(self):
+
+        Card.objects.create(
+            name='Plenty Card',
+            collection=self.collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=100
+        )
+        self.client.force_authenticate(user=self.user)
+        
+        url = reverse('card-list')
+        response = self.client.get(url, {'is_active': 'true', 'stock_quantity__lt': 10})
+        
+        self.assertEqual([c['name'] for c in response.data['results']], ['Test Card'])
+
+    def test_search_cards_by_prefix_ranks_name_matches_first(self):
+
+        Card.objects.create(
+            name='Fire Sprite',
+            description='Breathes like a dragon',
+            collection=self.collection,
+            base_price=Decimal('10.00')
+        )
+        Card.objects.create(
+            name='Dragon Knight',
+            collection=self.collection,
+            base_price=Decimal('10.00')
+        )
+        self.client.force_authenticate(user=self.user)
+        
+        url = reverse('card-list')
+        response = self.client.get(url, {'search': 'drag'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Dragon Knight', 'Fire Sprite'])
+        
+        response = self.client.get(url, {'search': 'drag', 'ordering': 'name'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Dragon Knight', 'Fire Sprite'])
+
+    def test_search_cards_follows_collection_rename(self):
+
+        self.client.force_authenticate(user=self.user)
+        self.collection.name = 'Winter Legends'
+        self.collection.save()
+        
+        url = reverse('card-list')
+        response = self.client.get(url, {'search': 'legend'})
+        self.assertEqual([c['name'] for c in response.data['results']], ['Test Card'])
+
+    def test_sparse_fieldset_trims_payload_and_columns(self):
+
+        self.client.force_authenticate(user=self.user)
+        
+        url = reverse('card-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,name,current_price'})
+        
+        self.assertEqual(response.json()['results'], [{'id': self.card.id, 'name': 'Test Card', 'current_price': 10.0}])
+        select = [q['sql'] for q in queries if q['sql'].startswith('SELECT "cards"."id"')][0]
+        self.assertNotIn('"cards"."description"', select)
+        self.assertNotIn('"collections"', select)
+
+    def test_sparse_fieldset_selects_nested_fields(self):
+
+        self.client.force_authenticate(user=self.user)
+        
+        url = reverse('card-detail', kwargs={'pk': self.card.pk})
+        response = self.client.get(url, {'fields': 'id,name,collection.name'})
+        
+        self.assertEqual(response.data, {'id': self.card.id, 'name': 'Test Card', 'collection': {'name': 'Test Collection'}})
+
+    def test_expand_collection_on_card_list(self):
+
+        other = Collection.objects.create(name='Other Collection', created_by=self.user)
+        for i in range(3):
+            Card.objects.create(name=f'Card {i}', collection=other, base_price=Decimal('1.00'))
+        self.client.force_authenticate(user=self.user)
+        
+        url = reverse('card-list')
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'expand': 'collection'})
+        
+        self.assertEqual(response.data['results'][0]['collection']['total_cards'], 1)
+        self.assertEqual(response.data['results'][-1]['collection']['total_cards'], 3)
+        self.assertNotIn('collection', self.client.get(url).data['results'][0])
+
     def test_cards_require_authentication(self):
 
         url = reverse('card-list')
@@ -412,6 +591,19 @@ class OrderViewSetTestCase(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['user']['id'], self.user.id)
 
+    def test_sparse_fieldset_trims_order_columns(self):
+
+        url = reverse('order-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,order_number,status'})
+
+        self.assertEqual(response.json()['results'], [
+            {'id': self.order.id, 'order_number': self.order.order_number, 'status': 'processing'}
+        ])
+        select = [q['sql'] for q in queries if q['sql'].startswith('SELECT "orders"."id"')][0]
+        self.assertNotIn('"orders"."notes"', select)
+        self.assertNotIn('JOIN "users"', select)
+
     def test_cannot_see_others_orders(self):
 
         Order.objects.create(
@@ -446,6 +638,112 @@ class OrderViewSetTestCase(APITestCase):
         order = Order.objects.filter(user=self.user).latest('created_at')
         self.assertEqual(order.items.count(), 1)
 
+    def post_order(self, cards):
+
+        url = reverse('order-list')
+        data = {
+            'order_value': '10.00',
+            'items': [
+                {'card_id': card.id, 'quantity': 1, 'unit_price': '10.00'}
+                for card in cards
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(queries)
+
+    def test_create_order_query_count_is_constant(self):
+
+        cards = [
+            Card.objects.create(
+                name=f'Bulk Card {i}',
+                collection=self.collection,
+                base_price=Decimal('10.00'),
+                stock_quantity=50
+            )
+            for i in range(50)
+        ]
+        
+        _, small = self.post_order(cards[:2])
+        response, large = self.post_order(cards)
+        
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data['items']), 50)
+        order = Order.objects.filter(user=self.user).latest('created_at')
+        self.assertEqual(order.items.count(), 50)
+        self.assertEqual(cards[0].sales_tally.quantity_sold, 2)
+
+    def test_create_order_rejects_duplicate_cards(self):
+
+        url = reverse('order-list')
+        data = {
+            'order_value': '20.00',
+            'items': [
+                {'card_id': self.card.id, 'quantity': 1, 'unit_price': '10.00'},
+                {'card_id': self.card.id, 'quantity': 1, 'unit_price': '10.00'}
+            ]
+        }
+        
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OrderItem.objects.exists())
+
+    def test_create_order_ignores_client_prices(self):
+
+        url = reverse('order-list')
+        data = {
+            'order_value': '0.01',
+            'items': [
+                {'card_id': self.card.id, 'quantity': 3, 'unit_price': '12.50'}
+            ]
+        }
+        
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['order_value'], '30.00')
+        self.assertEqual(response.data['items'][0]['unit_price'], '10.00')
+        
+        order = Order.objects.filter(user=self.user).latest('created_at')
+        self.assertEqual(order.order_value, Decimal('30.00'))
+        self.assertEqual(order.items.get().unit_price, self.card.current_price)
+
+    def test_update_cannot_change_order_value(self):
+
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        response = self.client.patch(url, {'order_value': '0.50', 'notes': 'Gift'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['order_value'], '100.00')
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.order_value, Decimal('100.00'))
+        self.assertEqual(self.order.notes, 'Gift')
+
+    def test_update_cannot_change_status(self):
+
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        data = {'status': 'cancelled', 'completed_date': '2024-01-01T00:00:00Z'}
+        response = self.client.patch(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'processing')
+        self.assertIsNone(self.order.completed_date)
+
+    def test_destroy_only_deletes_cancelled_orders(self):
+
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        response = self.client.delete(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Order.objects.filter(pk=self.order.pk).exists())
+        
+        self.client.post(reverse('order-cancel', kwargs={'pk': self.order.pk}))
+        response = self.client.delete(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Order.objects.filter(pk=self.order.pk).exists())
+
     def test_complete_order(self):
 
         url = reverse('order-complete', kwargs={'pk': self.order.pk})
@@ -457,6 +755,19 @@ class OrderViewSetTestCase(APITestCase):
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, 'completed')
 
+    def test_complete_order_writes_only_transition_columns(self):
+
+        url = reverse('order-complete', kwargs={'pk': self.order.pk})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url)
+        
+        sql, = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "orders"')]
+        assignments = sql.split(' SET ')[1].split(' WHERE ')[0]
+        self.assertEqual(
+            sorted(column.split(' = ')[0] for column in assignments.split(', ')),
+            ['"completed_date"', '"status"', '"updated_at"']
+        )
+
     def test_cancel_order(self):
 
         url = reverse('order-cancel', kwargs={'pk': self.order.pk})
@@ -485,6 +796,95 @@ class OrderViewSetTestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_list_orders_query_count_is_constant(self):
+
+        collection = Collection.objects.create(name='Second Collection', created_by=self.user)
+        for i in range(5):
+            order = Order.objects.create(user=self.user, order_value=Decimal('30.00'))
+            OrderItem.objects.create(order=order, card=self.card, quantity=1, unit_price=Decimal('10.00'))
+            card = Card.objects.create(name=f'Card {i}', collection=collection, base_price=Decimal('20.00'))
+            OrderItem.objects.create(order=order, card=card, quantity=1, unit_price=Decimal('20.00'))
+        
+        url = reverse('order-list')
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(
+            sorted(order['total_items'] for order in response.data['results']),
+            [0, 2, 2, 2, 2, 2]
+        )
+        self.assertEqual(response.data['results'][0]['items'][0]['card']['collection_name'], 'Test Collection')
+
+    def test_retrieve_order_query_count(self):
+
+        OrderItem.objects.create(order=self.order, card=self.card, quantity=1, unit_price=Decimal('10.00'))
+        
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        
+        self.assertEqual(response.data['total_items'], 1)
+
+    def test_filter_orders_by_status(self):
+
+        Order.objects.create(user=self.user, order_value=Decimal('20.00'), status='completed')
+        
+        url = reverse('order-list')
+        response = self.client.get(url, {'status': 'completed'})
+        
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['status'], 'completed')
+        
+        response = self.client.get(url, {'status__in': 'processing,completed', 'ordering': 'order_value'})
+        self.assertEqual([o['order_value'] for o in response.data['results']], ['20.00', '100.00'])
+
+    def test_cursor_pagination_walks_all_orders(self):
+
+        for i in range(6):
+            Order.objects.create(user=self.user, order_value=Decimal('10.00'))
+        Order.objects.filter(pk__in=Order.objects.order_by('id').values('pk')[:4]).update(
+            order_date=self.order.order_date
+        )
+        expected = list(Order.objects.order_by('-order_date', '-id').values_list('id', flat=True))
+        
+        url = reverse('order-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 3})
+        seen = [o['id'] for o in response.data['results']]
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNone(response.data['count'])
+        while response.data['next']:
+            previous_page = response
+            response = self.client.get(response.data['next'])
+            seen += [o['id'] for o in response.data['results']]
+        
+        self.assertEqual(seen, expected)
+        back = self.client.get(response.data['previous'])
+        self.assertEqual(back.data['results'], previous_page.data['results'])
+
+    def test_cursor_pagination_rejects_bad_cursor(self):
+
+        url = reverse('order-list')
+        response = self.client.get(url, {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_size_is_capped_and_count_can_be_skipped(self):
+
+        for i in range(3):
+            Order.objects.create(user=self.user, order_value=Decimal('10.00'))
+        
+        url = reverse('order-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'page_size': 2, 'count': 'none'})
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        
+        response = self.client.get(url, {'page_size': 1000, 'count': 'estimate'})
+        self.assertEqual(response.data['count'], 4)
+        self.assertIsNone(response.data['next'])
+
     def test_cannot_access_others_order(self):
 
         other_order = Order.objects.create(
@@ -498,10 +898,239 @@ class OrderViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class OrderImportTestCase(APITestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            password='testpass123'
+        )
+        self.collection = Collection.objects.create(
+            name='Test Collection',
+            created_by=self.user
+        )
+        self.cards = [
+            Card.objects.create(
+                name=f'Import Card {i}',
+                collection=self.collection,
+                base_price=Decimal('10.00'),
+                stock_quantity=5
+            )
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def import_lines(self, lines):
+        body = '\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        response = self.client.post(reverse('order-import'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def order_line(self, card, quantity=1):
+        return {'items': [{'card_id': card.id, 'quantity': quantity, 'unit_price': '10.00'}]}
+
+    def test_import_returns_result_per_line(self):
+
+        results = self.import_lines([
+            self.order_line(self.cards[0], 2),
+            'not json',
+            {'items': [{'card_id': 999999, 'quantity': 1, 'unit_price': '10.00'}]},
+            self.order_line(self.cards[1], 6),
+            self.order_line(self.cards[2]),
+        ])
+        
+        self.assertEqual([r['line'] for r in results], [1, 2, 3, 4, 5])
+        self.assertEqual([r['status'] for r in results], ['created', 'error', 'error', 'error', 'created'])
+        self.assertEqual(results[0]['order_value'], '20.00')
+        self.assertIn('card_id', results[2]['errors']['items'][0])
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(OrderItem.objects.count(), 2)
+        self.cards[0].refresh_from_db()
+        self.assertEqual(self.cards[0].stock_quantity, 3)
+        self.assertEqual(dashboard_counters()['total_orders'], 2)
+        self.assertEqual(self.cards[0].sales_tally.quantity_sold, 2)
+
+    def test_import_reserves_stock_across_lines(self):
+
+        results = self.import_lines([self.order_line(self.cards[0], 3)] * 3)
+        
+        self.assertEqual([r['status'] for r in results], ['created', 'error', 'error'])
+        self.cards[0].refresh_from_db()
+        self.assertEqual(self.cards[0].stock_quantity, 2)
+
+    def test_import_spools_results_before_the_response_streams(self):
+
+        body = json.dumps(self.order_line(self.cards[0], 2))
+        response = self.client.post(reverse('order-import'), body, content_type='application/x-ndjson')
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.cards[0].refresh_from_db()
+        self.assertEqual(self.cards[0].stock_quantity, 3)
+        result = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(result['id'], Order.objects.get().id)
+
+    def test_failed_chunk_reports_errors_and_keeps_earlier_results(self):
+
+        def fail_after_first_chunk(user, orders, cards):
+            if Order.objects.exists():
+                raise DatabaseError('connection lost')
+            return create_orders(user, orders, cards)
+
+        with patch('api.imports.IMPORT_CHUNK_SIZE', 1), \
+                patch('api.imports.create_orders', side_effect=fail_after_first_chunk):
+            results = self.import_lines([self.order_line(self.cards[0]), self.order_line(self.cards[1])])
+
+        self.assertEqual([result['status'] for result in results], ['created', 'error'])
+        self.assertIn('not saved', results[1]['errors']['non_field_errors'][0])
+        self.assertEqual(list(Order.objects.values_list('id', flat=True)), [results[0]['id']])
+
+    def test_import_query_count_is_constant_per_chunk(self):
+
+        with CaptureQueriesContext(connection) as small:
+            self.import_lines([self.order_line(card) for card in self.cards[:1]])
+        with CaptureQueriesContext(connection) as large:
+            self.import_lines([self.order_line(card) for card in self.cards] * 2)
+        
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(Order.objects.count(), 7)
+
+
+class BulkOrderTransitionTestCase(APITestCase):
+
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            first_name='Test',
+            last_name='User',
+            password='testpass123'
+        )
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='adminpass123',
+            is_staff=True
+        )
+        self.collection = Collection.objects.create(
+            name='Test Collection',
+            created_by=self.user
+        )
+        self.card = Card.objects.create(
+            name='Test Card',
+            collection=self.collection,
+            base_price=Decimal('10.00'),
+            stock_quantity=100
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def create_orders(self, count, status='processing'):
+        return [
+            create_order(
+                self.user,
+                [{'card_id': self.card.id, 'quantity': 2, 'unit_price': Decimal('10.00')}],
+                status=status
+            )
+            for _ in range(count)
+        ]
+
+    def test_bulk_complete_reports_per_id_outcomes(self):
+
+        orders = self.create_orders(3)
+        cancelled = self.create_orders(1, status='cancelled')[0]
+        ids = [order.id for order in orders] + [cancelled.id, 999999]
+        
+        response = self.client.post(reverse('order-bulk-complete'), {'ids': ids}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(
+            [(r['id'], r['result']) for r in response.data['results']],
+            [(order.id, 'updated') for order in orders] + [(cancelled.id, 'skipped'), (999999, 'not_found')]
+        )
+        self.assertEqual(Order.objects.filter(status='completed', completed_date__isnull=False).count(), 3)
+        self.assertEqual(read_counters(), dashboard_counters())
+
+    def test_bulk_complete_query_count_is_constant(self):
+
+        small = [order.id for order in self.create_orders(2)]
+        large = [order.id for order in self.create_orders(20)]
+        
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.post(reverse('order-bulk-complete'), {'ids': small}, format='json')
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.post(reverse('order-bulk-complete'), {'ids': large}, format='json')
+        
+        self.assertEqual(len(small_queries), len(large_queries))
+
+    def test_bulk_cancel_restocks_and_removes_sales(self):
+
+        orders = self.create_orders(3)
+        
+        response = self.client.post(
+            reverse('order-bulk-cancel'), {'ids': [order.id for order in orders[:2]]}, format='json'
+        )
+        
+        self.assertEqual(response.data['updated'], 2)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.stock_quantity, 98)
+        self.assertEqual(self.card.sales_tally.quantity_sold, 2)
+        self.assertEqual(read_counters(), dashboard_counters())
+
+    def test_bulk_complete_by_filter(self):
+
+        self.create_orders(2)
+        self.create_orders(1, status='cancelled')
+        
+        response = self.client.post(reverse('order-bulk-complete') + '?status=processing', {}, format='json')
+        
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(Order.objects.filter(status='completed').count(), 2)
+
+    def test_bulk_action_rejects_undeclared_params(self):
+
+        orders = self.create_orders(2)
+
+        for query in ('?page_size=5', '?status=processing&page_size=5', '?ordering=id', '?status='):
+            response = self.client.post(reverse('order-bulk-cancel') + query, {}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+        self.assertEqual(Order.objects.filter(pk__in=[order.id for order in orders], status='processing').count(), 2)
+
+    def test_bulk_action_by_filter_is_capped(self):
+
+        self.create_orders(3)
+        url = reverse('order-bulk-complete') + '?status=processing'
+
+        with patch('api.views.BULK_ORDER_LIMIT', 2):
+            response = self.client.post(url, {}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertFalse(Order.objects.filter(status='completed').exists())
+
+            response = self.client.post(url, {'all': True}, format='json')
+        self.assertEqual(response.data['updated'], 3)
+
+    def test_bulk_actions_require_selection_and_staff(self):
+
+        response = self.client.post(reverse('order-bulk-complete'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('order-bulk-cancel'), {'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class DashboardKPIsTestCase(APITestCase):
 
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
@@ -561,6 +1190,125 @@ class DashboardKPIsTestCase(APITestCase):
         self.assertEqual(response.data['completed_orders'], 1)
         self.assertEqual(response.data['issued_collections'], 1)
 
+    def test_dashboard_counters_cover_every_status(self):
+
+        for order_status, _ in Order.STATUS_CHOICES:
+            Order.objects.create(
+                user=self.user,
+                order_value=Decimal('5.00'),
+                status=order_status
+            )
+        Collection.objects.create(name='Pending Collection', status='pending')
+        Collection.objects.create(name='Production Collection', status='in_production')
+        
+        url = reverse('dashboard-kpis')
+        response = self.client.get(url)
+        
+        self.assertEqual(response.data['total_orders'], 4)
+        self.assertEqual(response.data['pending_orders'], 1)
+        self.assertEqual(response.data['completed_orders'], 2)
+        self.assertEqual(response.data['cancelled_orders'], 1)
+        self.assertEqual(str(response.data['total_revenue']), '105.00')
+        self.assertEqual(response.data['total_collections'], 3)
+        self.assertEqual(response.data['active_collections'], 2)
+        self.assertEqual(response.data['total_users'], 1)
+
+    def test_dashboard_counters_query_count_is_constant(self):
+
+        with self.assertNumQueries(4):
+            dashboard_counters()
+        
+        for i in range(20):
+            Collection.objects.create(name=f'Collection {i}', status='pending')
+            Order.objects.create(
+                user=self.user,
+                order_value=Decimal('10.00'),
+                status=Order.STATUS_CHOICES[i % len(Order.STATUS_CHOICES)][0]
+            )
+        
+        with self.assertNumQueries(4):
+            counters = dashboard_counters()
+        self.assertEqual(counters['total_orders'], 21)
+        self.assertEqual(counters['total_collections'], 21)
+
+    def test_order_change_invalidates_cached_kpis(self):
+
+        url = reverse('dashboard-kpis')
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_orders'], 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(
+                user=self.user,
+                order_value=Decimal('50.00'),
+                status='completed'
+            )
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_orders'], 2)
+        self.assertEqual(str(response.data['total_revenue']), '150.00')
+        self.assertEqual(len(response.data['recent_orders']), 2)
+
+    def test_invalidation_is_scoped_to_affected_sections(self):
+
+        sections = DashboardKPIsView.sections
+        self.client.get(reverse('dashboard-kpis'))
+        before = section_keys(sections)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Collection.objects.create(name='Another Collection')
+        
+        after = section_keys(sections)
+        self.assertNotEqual(before['collection_counters'], after['collection_counters'])
+        for section in ('order_counters', 'user_counters', 'recent_orders', 'top_sellers'):
+            self.assertEqual(before[section], after[section])
+
+    def test_recent_orders_query_count_is_constant(self):
+
+        for i in range(12):
+            order = Order.objects.create(user=self.user, order_value=Decimal('10.00'))
+            OrderItem.objects.create(order=order, card=self.card, quantity=1, unit_price=Decimal('10.00'))
+        
+        with self.assertNumQueries(2):
+            data = DashboardKPIsView().compute_recent_orders()
+        
+        self.assertEqual(len(data['recent_orders']), 10)
+        self.assertEqual(data['recent_orders'][0]['total_items'], 1)
+
+    def test_top_selling_cards_come_from_tally(self):
+
+        url = reverse('dashboard-kpis')
+        response = self.client.get(url)
+        
+        self.assertEqual([card['id'] for card in response.data['top_selling_cards']], [self.card.id])
+
+    def test_top_selling_cards_window(self):
+
+        url = reverse('dashboard-top-selling-cards')
+        response = self.client.get(url, {'days': 7})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['id'], self.card.id)
+        self.assertEqual(response.data[0]['total_sold'], 2)
+        self.assertEqual(response.data[0]['total_revenue'], '20.00')
+
+    def test_top_selling_cards_rejects_unknown_window(self):
+
+        url = reverse('dashboard-top-selling-cards')
+        response = self.client.get(url, {'days': 5})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_top_selling_cards_rejects_non_positive_limit(self):
+
+        url = reverse('dashboard-top-selling-cards')
+        for limit in (-1, 0):
+            response = self.client.get(url, {'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, limit)
+
+        response = self.client.get(url, {'limit': 1})
+        self.assertEqual(len(response.data), 1)
+
     def test_dashboard_requires_authentication(self):
 
         self.client.force_authenticate(user=None)
@@ -617,4 +1365,42 @@ class PermissionsTestCase(APITestCase):
             self.assertIn(
                 response.status_code,
                 [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
-            ) 
\ No newline at end of file
+            ) 
+
+
+class FilterIndexTestCase(TestCase):
+
+
+    def assertUsesIndex(self, queryset, index_name):
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_order_filters_use_indexes(self):
+
+        self.assertUsesIndex(
+            Order.objects.filter(status='processing').order_by('-order_date'),
+            'orders_status_date_idx'
+        )
+        self.assertUsesIndex(
+            Order.objects.filter(user_id=1).order_by('-order_date'),
+            'orders_user_date_idx'
+        )
+
+    def test_collection_filters_use_indexes(self):
+
+        self.assertUsesIndex(
+            Collection.objects.filter(status='pending').order_by('-created_at'),
+            'collections_status_created_idx'
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'SQLite ignores low-selectivity indexes without statistics')
+    def test_low_stock_filter_uses_index(self):
+
+        self.assertUsesIndex(
+            Card.objects.filter(is_active=True, stock_quantity__lt=10).order_by(),
+            'cards_active_stock_idx'
+        )
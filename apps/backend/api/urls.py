@@ -9,9 +9,13 @@ router.register(r'cards', views.CardViewSet)
 router.register(r'orders', views.OrderViewSet)
 
 urlpatterns = [
+    path('_metrics', views.MetricsView.as_view(), name='metrics'),
+    path('orders/import/', views.OrderImportView.as_view(), name='order-import'),
     path('', include(router.urls)),
     
     path('dashboard/kpis/', views.DashboardKPIsView.as_view(), name='dashboard-kpis'),
+    path('dashboard/top-selling-cards/', views.TopSellingCardsView.as_view(), name='dashboard-top-selling-cards'),
+    path('dashboard/sales-series/', views.SalesSeriesView.as_view(), name='dashboard-sales-series'),
     path('auth/register/', views.UserRegistrationView.as_view(), name='user-register'),
     path('auth/profile/', views.UserProfileView.as_view(), name='user-profile'),
 ] 
\ No newline at end of file
@@ -4,24 +4,46 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView
 from django.contrib.auth import login
-from django.db.models import Count, Sum, Q
-from django.core.cache import cache
-from django.utils import timezone
-from datetime import timedelta
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from rest_framework.filters import SearchFilter
 
 from .models import User, Collection, Card, Order, OrderItem
 from .serializers import (
     UserSerializer, UserProfileSerializer, CollectionSerializer,
     CardSerializer, CardListSerializer, OrderSerializer, OrderCreateSerializer,
-    LoginSerializer, DashboardKPISerializer
+    LoginSerializer, DashboardKPISerializer, TopSellingCardSerializer,
+    BULK_ORDER_LIMIT, BulkOrderActionSerializer, BulkOrderActionResponseSerializer,
+    SalesSeriesQuerySerializer, SalesSeriesSerializer
 )
+from .cache import get_or_compute, section_keys
+from .counters import (
+    read_counters, order_counter_keys, collection_counter_keys, user_counter_keys
+)
+from .dashboard import order_counters, collection_counters, user_counters
+from .sales import SALES_WINDOWS, top_selling_cards
+from .rollups import SALES_ROLLUP, read_watermark, sales_series
+from .metrics import PROMETHEUS_CONTENT_TYPE, registry
+from .orders import cancel_order, complete_order, transition_orders
+from .imports import import_orders, spool_results
+from .exports import ExportViewMixin, export_cards, export_orders
+from .pagination import KeysetPaginationMixin
+from .fieldsets import SparseFieldsetViewMixin
 from .permissions import (
     IsOwnerOrReadOnly, IsAuthenticatedOrCreateOnly, IsAdminOrReadOnly,
     IsCollectionOwnerOrReadOnly, CanManageOrders
 )
 
 
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter('fields', str, description="Comma-separated fields to return, dotted for nested fields"),
+    OpenApiParameter('expand', str, description="Comma-separated relations to embed"),
+]
+
+
 @extend_schema_view(
     list=extend_schema(description="List all users (admin only)"),
     create=extend_schema(description="Create a new user account"),
@@ -55,46 +77,72 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(description="List all collections"),
+    list=extend_schema(description="List all collections", parameters=SPARSE_FIELDSET_PARAMETERS),
     create=extend_schema(description="Create a new collection"),
-    retrieve=extend_schema(description="Get collection details"),
+    retrieve=extend_schema(description="Get collection details", parameters=SPARSE_FIELDSET_PARAMETERS),
     update=extend_schema(description="Update collection information"),
     destroy=extend_schema(description="Delete collection"),
 )
-class CollectionViewSet(viewsets.ModelViewSet):
+class CollectionViewSet(SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
 
     queryset = Collection.objects.all()
     serializer_class = CollectionSerializer
     permission_classes = [permissions.IsAuthenticated, IsCollectionOwnerOrReadOnly]
     filterset_fields = ['status', 'created_by']
     search_fields = ['name', 'description']
+    full_text_search = True
     ordering_fields = ['created_at', 'expected_release_date', 'name']
     ordering = ['-created_at']
+    keyset_ordering = ['-created_at', '-id']
+
+    def get_queryset(self):
+
+        return Collection.objects.with_card_count()
 
     @action(detail=True, methods=['get'])
     def cards(self, request, pk=None):
 
         collection = self.get_object()
-        cards = Card.objects.filter(collection=collection)
+        cards = Card.objects.filter(collection=collection).select_related('collection')
         serializer = CardListSerializer(cards, many=True)
         return Response(serializer.data)
 
 
 @extend_schema_view(
-    list=extend_schema(description="List all cards"),
+    list=extend_schema(description="List all cards", parameters=SPARSE_FIELDSET_PARAMETERS),
     create=extend_schema(description="Create a new card"),
-    retrieve=extend_schema(description="Get card details"),
+    retrieve=extend_schema(description="Get card details", parameters=SPARSE_FIELDSET_PARAMETERS),
     update=extend_schema(description="Update card information"),
     destroy=extend_schema(description="Delete card"),
 )
-class CardViewSet(viewsets.ModelViewSet):
+class CardViewSet(ExportViewMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
 
     queryset = Card.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsAdminOrReadOnly]
-    filterset_fields = ['category', 'rarity', 'collection', 'is_active']
+    filterset_fields = {
+        'category': ['exact'],
+        'rarity': ['exact'],
+        'collection': ['exact'],
+        'is_active': ['exact'],
+        'stock_quantity': ['lt', 'gte'],
+    }
     search_fields = ['name', 'description', 'collection__name']
+    full_text_search = True
     ordering_fields = ['created_at', 'name', 'base_price', 'stock_quantity']
-    ordering = ['collection', 'name']
+    ordering = ['collection_id', 'name']
+    keyset_ordering = ['collection_id', 'name', 'id']
+    exporter = staticmethod(export_cards)
+    export_filename = 'cards'
+
+    def get_queryset(self):
+
+        if self.action == 'export':
+            return Card.objects.all()
+        if self.action == 'list' and 'collection' not in self.expanded_fields():
+            return Card.objects.select_related('collection')
+        return Card.objects.prefetch_related(
+            Prefetch('collection', Collection.objects.with_card_count())
+        )
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -113,29 +161,48 @@ class CardViewSet(viewsets.ModelViewSet):
     list=extend_schema(description="List user's orders"),
     create=extend_schema(description="Create a new order"),
     retrieve=extend_schema(description="Get order details"),
-    update=extend_schema(description="Update order status"),
-    destroy=extend_schema(description="Cancel order"),
+    update=extend_schema(description="Update order notes"),
+    destroy=extend_schema(description="Delete a cancelled order"),
 )
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ExportViewMixin, SparseFieldsetViewMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
 
     queryset = Order.objects.all()
     permission_classes = [permissions.IsAuthenticated, CanManageOrders]
-    filterset_fields = ['status', 'order_date']
+    filterset_fields = {
+        'status': ['exact', 'in'],
+        'order_date': ['exact', 'gte', 'lte'],
+    }
     search_fields = ['order_number', 'user__email']
     ordering_fields = ['order_date', 'order_value']
     ordering = ['-order_date']
+    keyset_ordering = ['-order_date', '-id']
+    exporter = staticmethod(export_orders)
+    export_filename = 'orders'
 
     def get_queryset(self):
 
+        queryset = Order.objects.all() if self.action == 'export' else Order.objects.with_details()
         if self.request.user.is_staff:
-            return Order.objects.all()
-        return Order.objects.filter(user=self.request.user)
+            return queryset
+        return queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderCreateSerializer
         return OrderSerializer
 
+    def destroy(self, request, *args, **kwargs):
+
+        order = self.get_object()
+        if order.status != 'cancelled':
+            return Response(
+                {'error': 'Only cancelled orders can be deleted.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        order.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
 
@@ -146,9 +213,12 @@ class OrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        order.status = 'completed'
-        order.completed_date = timezone.now()
-        order.save()
+        complete_order(order)
+        if order.status != 'completed':
+            return Response(
+                {'error': 'Only processing orders can be completed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         serializer = OrderSerializer(order)
         return Response(serializer.data)
@@ -163,16 +233,109 @@ class OrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        order.status = 'cancelled'
-        order.save()
+        cancel_order(order)
+        if order.status != 'cancelled':
+            return Response(
+                {'error': 'Only processing orders can be cancelled.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         serializer = OrderSerializer(order)
         return Response(serializer.data)
 
+    @extend_schema(
+        description="Complete many processing orders at once, selected by ids or by the list filters",
+        request=BulkOrderActionSerializer,
+        responses={200: BulkOrderActionResponseSerializer}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-complete', permission_classes=[permissions.IsAdminUser])
+    def bulk_complete(self, request):
+
+        return self.bulk_transition(request, 'complete')
+
+    @extend_schema(
+        description="Cancel many processing orders at once, selected by ids or by the list filters",
+        request=BulkOrderActionSerializer,
+        responses={200: BulkOrderActionResponseSerializer}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-cancel', permission_classes=[permissions.IsAdminUser])
+    def bulk_cancel(self, request):
+
+        return self.bulk_transition(request, 'cancel')
+
+    def bulk_transition(self, request, transition):
+        serializer = BulkOrderActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get('ids')
+        if ids is not None:
+            queryset = Order.objects.filter(pk__in=ids)
+        else:
+            filters = self.bulk_filter_params(Order.objects.all())
+            unknown = sorted(set(request.query_params) - filters)
+            if unknown:
+                return Response(
+                    {'error': f"Unsupported filter parameters: {', '.join(unknown)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not any(request.query_params.get(name) for name in filters):
+                return Response(
+                    {'error': 'Provide a list of ids or at least one filter.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = self.filter_queryset(Order.objects.all())
+            if not serializer.validated_data['all']:
+                matched = queryset.count()
+                if matched > BULK_ORDER_LIMIT:
+                    return Response(
+                        {'error': f'{matched} orders match the filters; narrow them or confirm with "all": true.'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+        changed, statuses = transition_orders(queryset, transition)
+        results = []
+        for order_id in dict.fromkeys(ids) if ids is not None else sorted(statuses):
+            if order_id in changed:
+                results.append({'id': order_id, 'result': 'updated', 'status': statuses[order_id]})
+            elif order_id in statuses:
+                results.append({'id': order_id, 'result': 'skipped', 'status': statuses[order_id]})
+            else:
+                results.append({'id': order_id, 'result': 'not_found'})
+        return Response({'updated': len(changed), 'results': results})
+
+    def bulk_filter_params(self, queryset):
+        params = set()
+        for backend_class in self.filter_backends:
+            backend = backend_class()
+            if isinstance(backend, DjangoFilterBackend):
+                params.update(backend.get_filterset_class(self, queryset).base_filters)
+            elif isinstance(backend, SearchFilter):
+                params.add(backend.search_param)
+        return params
+
+
+class OrderImportView(APIView):
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description="Bulk import orders from a newline-delimited JSON body, one order per line. "
+                    "Returns one NDJSON result per input line.",
+        request={'application/x-ndjson': OrderCreateSerializer},
+        responses={200: None}
+    )
+    def post(self, request):
+
+        results = spool_results(import_orders(request.stream, request.user, {'request': request}))
+        return StreamingHttpResponse(results, content_type='application/x-ndjson')
+
 
 class DashboardKPIsView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
+    sections = (
+        'order_counters', 'collection_counters', 'user_counters',
+        'recent_orders', 'top_sellers',
+    )
 
     @extend_schema(
         description="Get dashboard KPIs including orders, revenue, collections, and cards statistics",
@@ -180,60 +343,116 @@ class DashboardKPIsView(APIView):
     )
     def get(self, request):
 
-        cache_key = 'dashboard_kpis'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return Response(cached_data)
-
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        total_orders = Order.objects.count()
-        total_revenue = Order.objects.filter(
-            status='completed'
-        ).aggregate(Sum('order_value'))['order_value__sum'] or 0
-        
-        pending_orders = Order.objects.filter(status='processing').count()
-        completed_orders = Order.objects.filter(status='completed').count()
-        cancelled_orders = Order.objects.filter(status='cancelled').count()
-        
-        total_collections = Collection.objects.count()
-        active_collections = Collection.objects.filter(
-            status__in=['pending', 'in_production']
-        ).count()
-        issued_collections = Collection.objects.filter(status='issued').count()
-        
-        total_cards = Card.objects.count()
-        
-        total_users = User.objects.filter(is_active=True).count()
-        
-        recent_orders = Order.objects.select_related('user').order_by('-order_date')[:10]
-        
-        top_selling_cards = Card.objects.annotate(
-            total_sold=Sum('order_items__quantity')
-        ).filter(
-            total_sold__isnull=False
-        ).order_by('-total_sold')[:10]
-        
-        kpi_data = {
-            'total_orders': total_orders,
-            'total_revenue': total_revenue,
-            'total_collections': total_collections,
-            'total_cards': total_cards,
-            'pending_orders': pending_orders,
-            'completed_orders': completed_orders,
-            'cancelled_orders': cancelled_orders,
-            'active_collections': active_collections,
-            'issued_collections': issued_collections,
-            'total_users': total_users,
-            'recent_orders': OrderSerializer(recent_orders, many=True).data,
-            'top_selling_cards': CardListSerializer(top_selling_cards, many=True).data,
-        }
-        
-        cache.set(cache_key, kpi_data, 300)
-        
+        kpi_data = {}
+        for section, key in section_keys(self.sections).items():
+            kpi_data.update(get_or_compute(
+                key,
+                getattr(self, f'compute_{section}'),
+                timeout=settings.DASHBOARD_CACHE_TIMEOUT
+            ))
         return Response(kpi_data)
 
+    def compute_order_counters(self):
+
+        return read_counters(order_counter_keys()) or order_counters()
+
+    def compute_collection_counters(self):
+
+        return read_counters(collection_counter_keys()) or collection_counters()
+
+    def compute_user_counters(self):
+
+        return read_counters(user_counter_keys()) or user_counters()
+
+    def compute_recent_orders(self):
+
+        recent_orders = Order.objects.with_details().order_by('-order_date')[:10]
+        return {'recent_orders': OrderSerializer(recent_orders, many=True).data}
+
+    def compute_top_sellers(self):
+
+        return {'top_selling_cards': CardListSerializer(top_selling_cards(), many=True).data}
+
+
+class TopSellingCardsView(APIView):
+
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    @extend_schema(
+        description="Get the best selling cards, optionally restricted to the last 7, 30 or 90 days",
+        parameters=[
+            OpenApiParameter('days', int, enum=SALES_WINDOWS),
+            OpenApiParameter('limit', int),
+        ],
+        responses={200: TopSellingCardSerializer(many=True)}
+    )
+    def get(self, request):
+
+        days = request.query_params.get('days')
+        limit = request.query_params.get('limit', 10)
+        try:
+            days = int(days) if days else None
+            limit = min(int(limit), self.max_limit)
+        except ValueError:
+            return Response(
+                {'error': 'days and limit must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if days is not None and days not in SALES_WINDOWS:
+            return Response(
+                {'error': f'days must be one of {", ".join(map(str, SALES_WINDOWS))}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit < 1:
+            return Response(
+                {'error': 'limit must be at least 1.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        key = f"{section_keys(['top_sellers'])['top_sellers']}:{days or 'all'}:{limit}"
+        data = get_or_compute(
+            key,
+            lambda: TopSellingCardSerializer(top_selling_cards(limit, days), many=True).data,
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT
+        )
+        return Response(data)
+
+
+class SalesSeriesView(APIView):
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description="Get order count, revenue and items sold per day, week or month from the daily sales rollup. "
+                    "Cancelled orders are excluded unless requested through status.",
+        parameters=[SalesSeriesQuerySerializer],
+        responses={200: SalesSeriesSerializer}
+    )
+    def get(self, request):
+
+        query = SalesSeriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        series = sales_series(params['granularity'], params['start'], params['end'], params.get('status'))
+        return Response(SalesSeriesSerializer({
+            'granularity': params['granularity'],
+            'start': params['start'],
+            'end': params['end'],
+            'as_of': read_watermark(SALES_ROLLUP),
+            'series': series,
+        }).data)
+
+
+class MetricsView(APIView):
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+
+        return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 
 class UserRegistrationView(CreateAPIView):
 